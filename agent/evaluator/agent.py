@@ -11,20 +11,37 @@ from __future__ import annotations
 import json
 import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
 from eval.models import GroundTruth, WalletThesis, EvalScore, EvalReport
 from eval.scorer import build_judge_prompt, assessment_to_score, JudgeAssessment
-from agent.llm import call_llm_json
+from agent.llm import call_llm_json, gather_limited
 from config import EVALUATOR_MODEL, JUDGE_MODEL, PERFORMANCE_DIR, EVAL_DIR
 
 
 SCORES_FILE = PERFORMANCE_DIR / "scores.jsonl"
 TRENDS_FILE = PERFORMANCE_DIR / "trends.json"
 
+JUDGE_SYSTEM_PROMPT = "You are an expert evaluator. Respond in valid JSON with fields: strategy_correct, strategy_partial, evidence_matches (list), evidence_missed (list), false_claims (list), specificity_score (0-1), confidence_appropriate (0-1), reasoning (string)."
+JUDGE_BATCH_SYSTEM_PROMPT = (
+    "You are an expert evaluator. You will receive several numbered evaluation tasks. "
+    "Assess each one independently and respond in valid JSON as "
+    '{"assessments": [...]} with exactly one assessment per task, in task order. '
+    "Each assessment has fields: strategy_correct, strategy_partial, evidence_matches (list), "
+    "evidence_missed (list), false_claims (list), specificity_score (0-1), "
+    "confidence_appropriate (0-1), reasoning (string)."
+)
+# Theses per batched judge call
+JUDGE_BATCH_SIZE = 10
 
+
+@lru_cache(maxsize=1)
 def load_ground_truth() -> dict[str, GroundTruth]:
-    """Load ground truth indexed by wallet address."""
+    """Load ground truth indexed by wallet address.
+
+    Parsed once per process; callers must treat the returned dict as read-only.
+    """
     gt_file = EVAL_DIR / "ground_truth" / "labeled.json"
     if not gt_file.exists():
         return {}
@@ -49,7 +66,7 @@ async def score_thesis(
         try:
             raw = await call_llm_json(
                 [
-                    {"role": "system", "content": "You are an expert evaluator. Respond in valid JSON with fields: strategy_correct, strategy_partial, evidence_matches (list), evidence_missed (list), false_claims (list), specificity_score (0-1), confidence_appropriate (0-1), reasoning (string)."},
+                    {"role": "system", "content": JUDGE_SYSTEM_PROMPT},
                     {"role": "user", "content": judge_prompt},
                 ],
                 model=JUDGE_MODEL,
@@ -59,17 +76,7 @@ async def score_thesis(
                 wallet=thesis.wallet, gt=gt, assessment=assessment
             )
         except Exception as e:
-            # Fallback: simple strategy match
-            score = EvalScore(
-                wallet=thesis.wallet,
-                predicted_strategy=thesis.primary_strategy.value,
-                actual_strategy=gt.primary_strategy.value,
-                strategy_correct=thesis.primary_strategy == gt.primary_strategy,
-                evidence_recall=0.0,
-                false_claims=0,
-                specificity=0.5,
-                confidence_calibration=0.5,
-            )
+            score = _fallback_score(thesis, gt)
     else:
         # Heuristic scoring (no ground truth)
         score = _heuristic_score(thesis)
@@ -79,6 +86,85 @@ async def score_thesis(
     return score
 
 
+async def score_theses(
+    theses: list[WalletThesis],
+    ground_truth: dict[str, GroundTruth] | None = None,
+    batch_size: int = JUDGE_BATCH_SIZE,
+) -> list[EvalScore]:
+    """Score many theses, sending up to `batch_size` judge prompts per LLM call.
+
+    Returns scores in the same order as `theses`. A batch whose reply can't be
+    parsed or has the wrong number of assessments is re-scored one by one.
+    """
+    if ground_truth is None:
+        ground_truth = load_ground_truth()
+
+    judged = [t for t in theses if t.wallet in ground_truth]
+    batches = [judged[i:i + batch_size] for i in range(0, len(judged), batch_size)]
+    results = await gather_limited(_judge_batch(batch, ground_truth) for batch in batches)
+
+    by_id = {id(t): s for batch, scores in zip(batches, results) for t, s in zip(batch, scores)}
+    scores = []
+    for thesis in theses:
+        score = by_id.get(id(thesis))
+        if score is None:
+            score = _heuristic_score(thesis)
+            _append_score(score)
+        scores.append(score)
+    return scores
+
+
+async def _judge_batch(
+    theses: list[WalletThesis],
+    ground_truth: dict[str, GroundTruth],
+) -> list[EvalScore]:
+    """Judge several theses in one LLM call, falling back to per-thesis calls on a bad reply."""
+    if len(theses) == 1:
+        return [await score_thesis(theses[0], ground_truth)]
+
+    tasks = "\n\n".join(
+        f"===== TASK {i + 1} of {len(theses)} =====\n{build_judge_prompt(ground_truth[t.wallet], t)}"
+        for i, t in enumerate(theses)
+    )
+    try:
+        raw = await call_llm_json(
+            [
+                {"role": "system", "content": JUDGE_BATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": tasks},
+            ],
+            model=JUDGE_MODEL,
+        )
+        items = raw["assessments"]
+        if len(items) != len(theses):
+            raise ValueError(f"expected {len(theses)} assessments, got {len(items)}")
+        assessments = [JudgeAssessment(**item) for item in items]
+    except Exception:
+        return [await score_thesis(t, ground_truth) for t in theses]
+
+    scores = []
+    for thesis, assessment in zip(theses, assessments):
+        score = assessment_to_score(
+            wallet=thesis.wallet, gt=ground_truth[thesis.wallet], assessment=assessment
+        )
+        _append_score(score)
+        scores.append(score)
+    return scores
+
+
+def _fallback_score(thesis: WalletThesis, gt: GroundTruth) -> EvalScore:
+    """Simple strategy-match score used when the LLM judge fails."""
+    return EvalScore(
+        wallet=thesis.wallet,
+        predicted_strategy=thesis.primary_strategy.value,
+        actual_strategy=gt.primary_strategy.value,
+        strategy_correct=thesis.primary_strategy == gt.primary_strategy,
+        evidence_recall=0.0,
+        false_claims=0,
+        specificity=0.5,
+        confidence_calibration=0.5,
+    )
+
+
 def _heuristic_score(thesis: WalletThesis) -> EvalScore:
     """Score a thesis heuristically when no ground truth is available.
     
@@ -138,26 +224,28 @@ async def run_full_eval(
             timestamp=datetime.now(timezone.utc).isoformat(),
         )
 
-    scores = []
-    for wallet, gt in ground_truth.items():
-        print(f"  Evaluating {gt.username or wallet[:12]}...", end=" ", flush=True)
+    async def eval_one(wallet: str, gt: GroundTruth) -> EvalScore:
+        name = gt.username or wallet[:12]
         start = time.time()
         try:
             thesis = await analyze_fn(wallet)
             elapsed = time.time() - start
             score = await score_thesis(thesis, ground_truth)
             score.time_seconds = elapsed
-            scores.append(score)
-            print(f"{'✅' if score.strategy_correct else '❌'} {score.composite_score:.3f} ({elapsed:.1f}s)")
+            print(f"  {name}: {'✅' if score.strategy_correct else '❌'} {score.composite_score:.3f} ({elapsed:.1f}s)")
+            return score
         except Exception as e:
-            print(f"💥 {e}")
-            scores.append(EvalScore(
+            print(f"  {name}: 💥 {e}")
+            return EvalScore(
                 wallet=wallet,
                 predicted_strategy="error",
                 actual_strategy=gt.primary_strategy.value,
                 strategy_correct=False,
                 evidence_recall=0, false_claims=0, specificity=0, confidence_calibration=0,
-            ))
+            )
+
+    print(f"  Evaluating {len(ground_truth)} wallets...")
+    scores = await gather_limited(eval_one(w, gt) for w, gt in ground_truth.items())
 
     report = EvalReport(
         scores=scores,
@@ -12,6 +12,7 @@ It is deliberately constrained: it can only RUN existing skills, not modify them
 
 from __future__ import annotations
 import asyncio
+import hashlib
 import json
 import importlib
 import inspect
@@ -22,8 +23,9 @@ from eval.data_fetcher import get_wallet_ranking, get_wallet_positions, get_wall
 from agent.llm import call_llm_json
 from agent.executor.logger import ExecutorLogger
 from agent.executor.prompts import EXECUTOR_SYSTEM_PROMPT
-from config import EXECUTOR_MODEL, SKILLS_DIR
+from config import EXECUTOR_MODEL, ROOT, SKILLS_DIR
 import skills
+from skills._position_arrays import to_soa
 
 
 # Map of skill name -> function
@@ -51,6 +53,23 @@ def discover_skills() -> dict[str, callable]:
     return registry
 
 
+def executor_version() -> str:
+    """Hash of all source the executor's output depends on (its own code, skills, overrides).
+
+    Unchanged hash ⇒ re-running an analysis would use identical code, so a thesis can be reused.
+    """
+    h = hashlib.sha256()
+    sources = [
+        *sorted(Path(__file__).parent.glob("*.py")),
+        *sorted(SKILLS_DIR.glob("*.py")),
+        ROOT / "eval" / "skilled_analyzer.py",
+    ]
+    for path in sources:
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
 def search_skill(query: str) -> str | None:
     """Search for a relevant skill by keyword. Returns skill name or None."""
     registry = discover_skills()
@@ -103,12 +122,16 @@ async def run_analysis(wallet: str, model: str | None = None) -> tuple[WalletThe
     # Step 2: Run all skills
     registry = discover_skills()
     skill_results: dict[str, str] = {}
+    soa = to_soa(positions)  # shared column view for skills that accept it
 
     for skill_name, skill_fn in registry.items():
         logger.log_skill_search(skill_name, skill_name)
         try:
             logger.log_tool_call("run_skill", {"skill": skill_name})
-            result = skill_fn(positions)
+            if "soa" in inspect.signature(skill_fn).parameters:
+                result = skill_fn(positions, soa=soa)
+            else:
+                result = skill_fn(positions)
             text = result.to_text() if hasattr(result, "to_text") else str(result)
             skill_results[skill_name] = text
             # Store raw result for rule-based hints
@@ -134,9 +157,11 @@ async def run_analysis(wallet: str, model: str | None = None) -> tuple[WalletThe
         context += f"=== {name.upper()} ===\n{text}\n\n"
 
     # Step 4: Generate rule-based hints (from skilled_analyzer)
+    categories = None
     try:
-        from eval.skilled_analyzer import rule_based_hints
-        hints = rule_based_hints(sizing, flow, markets, len(positions))
+        from eval.skilled_analyzer import rule_based_hints, _category_summary
+        categories = _category_summary(markets)
+        hints = rule_based_hints(sizing, flow, markets, len(positions), categories)
         context += hints
         logger.log_reasoning(f"Rule-based hints: {hints[:300]}")
     except Exception as e:
@@ -172,7 +197,7 @@ async def run_analysis(wallet: str, model: str | None = None) -> tuple[WalletThe
     # Step 7: Apply hard overrides
     try:
         from eval.skilled_analyzer import _apply_hard_overrides
-        data = _apply_hard_overrides(data, sizing, flow, markets, len(positions), profile)
+        data = _apply_hard_overrides(data, sizing, flow, markets, len(positions), profile, categories)
         logger.log_reasoning(f"Final strategy after overrides: {data['primary_strategy']}")
     except Exception as e:
         logger.log_error(f"Hard overrides failed: {e}")
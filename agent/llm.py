@@ -1,11 +1,15 @@
 """Shared LLM client for all agents. Uses OpenAI API (works with OpenRouter too)."""
 
 from __future__ import annotations
+import asyncio
 import json
 import os
+from typing import Awaitable, Iterable
 from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+from config import MAX_CONCURRENCY
+
 load_dotenv()
 
 # Use OpenRouter if key available, otherwise OpenAI
@@ -62,3 +66,14 @@ async def call_llm_json(messages: list[dict], model: str, **kwargs) -> dict:
     if raw.startswith("```"):
         raw = raw.split("\n", 1)[1].rsplit("```", 1)[0]
     return json.loads(raw)
+
+
+async def gather_limited(aws: Iterable[Awaitable], limit: int = MAX_CONCURRENCY) -> list:
+    """Await all awaitables concurrently, at most `limit` at a time. Results keep input order."""
+    sem = asyncio.Semaphore(limit)
+
+    async def _run(aw: Awaitable):
+        async with sem:
+            return await aw
+
+    return await asyncio.gather(*(_run(aw) for aw in aws))
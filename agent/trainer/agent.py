@@ -8,6 +8,7 @@ The trainer:
 """
 
 from __future__ import annotations
+import hashlib
 import json
 from datetime import datetime, timezone
 from pathlib import Path
@@ -120,13 +121,30 @@ def _read_current_curriculum() -> str:
     return json.dumps(data, indent=2)
 
 
-async def generate_curriculum() -> dict:
+def _load_cached_curriculum(input_hash: str) -> dict | None:
+    """Return the saved curriculum if it was generated from the same inputs."""
+    curr_file = CURRICULUM_DIR / "current.json"
+    if not curr_file.exists():
+        return None
+    with open(curr_file) as f:
+        data = json.load(f)
+    return data if data.get("input_hash") == input_hash else None
+
+
+async def generate_curriculum(force: bool = False) -> dict:
     """Generate a new training curriculum based on performance data.
     
-    Returns the curriculum dict.
+    Skips the LLM call and returns the current curriculum when the performance
+    summary and available wallets are unchanged since it was generated, unless
+    `force` is set. Returns the curriculum dict.
     """
     performance = _read_performance_data()
     wallets = _read_available_wallets()
+    input_hash = hashlib.sha256(f"{performance}\n{wallets}".encode()).hexdigest()
+    if not force:
+        cached = _load_cached_curriculum(input_hash)
+        if cached is not None:
+            return cached
     current = _read_current_curriculum()
 
     context = f"""## PERFORMANCE DATA
@@ -148,6 +166,7 @@ async def generate_curriculum() -> dict:
 
     # Save curriculum
     result["generated_at"] = datetime.now(timezone.utc).isoformat()
+    result["input_hash"] = input_hash
     curr_file = CURRICULUM_DIR / "current.json"
     with open(curr_file, "w") as f:
         json.dump(result, f, indent=2)
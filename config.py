@@ -37,3 +37,7 @@ IMPROVER_MODEL = os.getenv("IMPROVER_MODEL", "anthropic/claude-sonnet-4")
 TRAINER_MODEL = os.getenv("TRAINER_MODEL", "anthropic/claude-sonnet-4")
 # Judge: smart, evaluates thesis quality
 JUDGE_MODEL = os.getenv("JUDGE_MODEL", "anthropic/claude-sonnet-4")
+
+# === Concurrency ===
+# Max wallet analyses / judge calls in flight at once (bounded by LLM rate limits)
+MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "8"))
@@ -8,6 +8,7 @@ Usage:
 
 from __future__ import annotations
 import asyncio
+import heapq
 import json
 import os
 from dotenv import load_dotenv
@@ -136,9 +137,9 @@ async def fetch_wallet_data_raw(wallet: str) -> str:
     
     # Top 50 positions by |PnL| (keeping prompt manageable)
     if positions:
-        sorted_pos = sorted(positions, key=lambda p: abs(p.pnl), reverse=True)
+        top_pos = heapq.nlargest(50, positions, key=lambda p: abs(p.pnl))
         text += f"\nTop 50 positions by |PnL| (of {len(positions)} total):\n"
-        for p in sorted_pos[:50]:
+        for p in top_pos:
             date = dt.fromtimestamp(p.ts).strftime('%Y-%m-%d') if p.ts else '?'
             win = "W" if p.pnl > 0 else "L"
             text += (
@@ -12,6 +12,9 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Callable
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 
@@ -22,7 +25,7 @@ from .run_eval import evaluate_analyzer
 
 import sys
 sys.path.insert(0, str(__file__).rsplit("/eval/", 1)[0])
-from skills import analyze_timing, analyze_sizing, analyze_markets, analyze_flow, analyze_patterns, analyze_correlations
+from skills._fused import run_all
 
 load_dotenv()
 
@@ -109,19 +112,55 @@ async def call_llm(messages: list[dict], model: str = ANALYZER_MODEL) -> str:
     return resp.choices[0].message.content
 
 
-def rule_based_hints(sizing, flow, markets, num_positions: int) -> str:
+@lru_cache(maxsize=4096)
+def _cat_kind(category: str) -> str:
+    """Classify a market category name as 'politics', 'crypto', 'sports' or 'other'.
+
+    Category names come from a small closed vocabulary, so the substring scan
+    runs once per distinct name and later lookups hit the cache.
+    """
+    c = str(category).lower()
+    if any(kw in c for kw in ('politic', 'news', 'election')):
+        return 'politics'
+    if 'crypto' in c:
+        return 'crypto'
+    if 'sport' in c:
+        return 'sports'
+    return 'other'
+
+
+def _category_summary(markets) -> dict:
+    """Top categories and their counts, shared by the hint and override rules.
+
+    Callers analysing one wallet compute this once and pass it as `precomputed`
+    to both rule_based_hints and _apply_hard_overrides.
+    """
+    cat_counts = getattr(markets, 'category_counts', {})
+    cat_values = list(cat_counts.values())[:5] if cat_counts else []
+    return {
+        "top_cats": list(cat_counts.keys())[:5] if cat_counts else [],
+        "cat_values": cat_values,
+        "total_cat": sum(cat_values) if cat_values else 1,
+    }
+
+
+def rule_based_hints(sizing, flow, markets, num_positions: int, precomputed: dict | None = None) -> str:
     """Generate rule-based classification hints from hard thresholds.
     
     Returns a string of strong hints to prepend to the LLM context.
     These override the LLM's tendency to default to model_based.
     """
     hints = []
+    if precomputed is None:
+        precomputed = _category_summary(markets)
     
     avg_pos = sizing.avg_position_size
     cv = sizing.coefficient_of_variation
     whale_pct = sizing.whale_count / max(num_positions, 1)
     win_rate = getattr(flow, 'win_rate', None) or 0.5
     profit_factor = getattr(flow, 'profit_factor', None) or 1.0
+    avg_entry = getattr(sizing, 'avg_entry_price', 0.5)
+    low_odds_pct = getattr(sizing, 'low_odds_pct', 0)
     
     # Detect strong edge (used to distinguish info_edge from whale)
     has_strong_edge = win_rate > 0.65 or profit_factor > 2.0
@@ -129,13 +168,13 @@ def rule_based_hints(sizing, flow, markets, num_positions: int) -> str:
     
     # Category analysis
     cat_counts = getattr(markets, 'category_counts', {})
-    top_cats = list(cat_counts.keys())[:5] if cat_counts else []
-    cat_values = list(cat_counts.values())[:5] if cat_counts else []
-    total_cat = sum(cat_values) if cat_values else 1
-    politics_focus = any('politic' in str(c).lower() or 'news' in str(c).lower() or 'election' in str(c).lower() for c in top_cats)
+    top_cats = precomputed["top_cats"]
+    cat_values = precomputed["cat_values"]
+    total_cat = precomputed["total_cat"]
+    politics_focus = any(_cat_kind(c) == 'politics' for c in top_cats)
     has_non_sports = any(c in top_cats for c in ['politics', 'entertainment', 'crypto', 'economics', 'science_tech', 'weather'])
     # Sports-dominant = sports is the #1 category with >40% of positions
-    sports_is_top = len(top_cats) > 0 and 'sport' in str(top_cats[0]).lower()
+    sports_is_top = len(top_cats) > 0 and _cat_kind(top_cats[0]) == 'sports'
     sports_pct = (cat_values[0] / total_cat) if sports_is_top and total_cat > 0 else 0
     sports_dominant = sports_is_top and sports_pct > 0.40
     
@@ -154,8 +193,8 @@ def rule_based_hints(sizing, flow, markets, num_positions: int) -> str:
         )
     
     # === INFO EDGE detection (ONLY for non-sports event markets) ===
-    low_entry = getattr(sizing, 'avg_entry_price', 0.5) < 0.45 or getattr(sizing, 'low_odds_pct', 0) > 0.30
-    politics_count = sum(v for c, v in cat_counts.items() if any(kw in str(c).lower() for kw in ['politic', 'news', 'election']))
+    low_entry = avg_entry < 0.45 or low_odds_pct > 0.30
+    politics_count = sum(v for c, v in cat_counts.items() if _cat_kind(c) == 'politics')
     politics_pct = politics_count / total_cat if total_cat > 0 else 0
     
     if avg_pos > 30_000 and has_strong_edge and has_non_sports and not sports_dominant:
@@ -165,8 +204,8 @@ def rule_based_hints(sizing, flow, markets, num_positions: int) -> str:
     elif has_non_sports and not sports_dominant and politics_pct > 0.25 and low_entry and profit_factor > 1.1:
         hints.append(
             f"⚠️ INFO EDGE SIGNAL (news-focused): {politics_pct:.0%} politics/news markets, "
-            f"avg entry price {getattr(sizing, 'avg_entry_price', 0.5):.2f}, "
-            f"low-odds entries {getattr(sizing, 'low_odds_pct', 0):.0%}, PF {profit_factor:.1f}. "
+            f"avg entry price {avg_entry:.2f}, "
+            f"low-odds entries {low_odds_pct:.0%}, PF {profit_factor:.1f}. "
             f"News/politics focus + early entry (low prices) = info edge trader who gets in before markets move. "
             f"NOT whale — whales bet BIG without timing advantage; info_edge traders bet BIG because they KNOW the outcome.")
     elif avg_pos > 30_000 and has_moderate_edge and has_non_sports and not sports_dominant and num_positions > 100:
@@ -242,7 +281,7 @@ def rule_based_hints(sizing, flow, markets, num_positions: int) -> str:
     # === MARKET MAKER detection: VERY specific — near-50% WR + thin edge + huge volume ===
     # Tightened: requires very thin edge AND very high position count
     # EXCEPTION: crypto-dominant wallets are more likely scalpers (execution timing on short-timeframe markets)
-    crypto_top = len(top_cats) > 0 and 'crypto' in str(top_cats[0]).lower()
+    crypto_top = len(top_cats) > 0 and _cat_kind(top_cats[0]) == 'crypto'
     crypto_pct = (cat_values[0] / total_cat) if crypto_top and total_cat > 0 else 0
     crypto_dominant_hint = crypto_top and crypto_pct > 0.60
     
@@ -321,16 +360,19 @@ async def skilled_analyze(wallet: str) -> WalletThesis:
         for p in positions_raw
     ]
 
-    # Run all 6 skills
-    timing = analyze_timing(positions)
-    sizing = analyze_sizing(positions)
-    markets = analyze_markets(positions)
-    flow = analyze_flow(positions)
-    patterns = analyze_patterns(positions)
-    correlations = analyze_correlations(positions)
+    # Run all 6 skills (one shared column extraction) on a worker thread, so other
+    # wallets' fetches keep progressing on the event loop meanwhile
+    results = await asyncio.to_thread(run_all, positions)
+    timing = results["timing_analysis"]
+    sizing = results["sizing_analysis"]
+    markets = results["markets_analysis"]
+    flow = results["flow_analysis"]
+    patterns = results["patterns_analysis"]
+    correlations = results["correlations_analysis"]
 
     # Generate rule-based hints
-    hints = rule_based_hints(sizing, flow, markets, len(positions))
+    categories = _category_summary(markets)
+    hints = rule_based_hints(sizing, flow, markets, len(positions), categories)
 
     # Build context
     context = f"Wallet: {wallet}\n"
@@ -372,62 +414,151 @@ async def skilled_analyze(wallet: str) -> WalletThesis:
     data["secondary_strategies"] = [s for s in data.get("secondary_strategies", []) if s in valid]
     
     # Post-classification hard overrides for clear misclassifications
-    data = _apply_hard_overrides(data, sizing, flow, markets, len(positions), profile)
+    data = _apply_hard_overrides(data, sizing, flow, markets, len(positions), profile, categories)
 
     return WalletThesis(**data)
 
 
-def _apply_hard_overrides(data: dict, sizing, flow, markets, num_positions: int, profile=None) -> dict:
-    """Override LLM classification when rule-based signals are unambiguous.
-    
-    CONSERVATIVE: only override when signals are very clear to avoid false positives.
+class OverrideContext:
+    """Every feature the override rules read, for one wallet.
+
+    Scalars are bound up front; category aggregates are cached properties, so a
+    rule whose scalar gates fail never pays for the category scans.
     """
-    predicted = data.get("primary_strategy", "unknown")
-    avg_pos = sizing.avg_position_size
-    cv = sizing.coefficient_of_variation
-    win_rate = getattr(flow, 'win_rate', None) or 0.5
-    profit_factor = getattr(flow, 'profit_factor', None) or 1.0
-    sharpe = getattr(profile, 'sharpe_score', None) if profile else None
-    
-    # Category analysis
-    cat_counts = getattr(markets, 'category_counts', {})
-    top_cats = list(cat_counts.keys())[:5] if cat_counts else []
-    cat_values = list(cat_counts.values())[:5] if cat_counts else []
-    total_cat = sum(cat_values) if cat_values else 1
-    has_non_sports = any(c in top_cats for c in ['politics', 'entertainment', 'crypto', 'economics', 'science_tech', 'weather'])
-    sports_is_top = len(top_cats) > 0 and 'sport' in str(top_cats[0]).lower()
-    sports_pct = (cat_values[0] / total_cat) if sports_is_top and total_cat > 0 else 0
-    sports_dominant = sports_is_top and sports_pct > 0.40
-    has_politics_news = any(c in str(top_cats).lower() for c in ['politic', 'news', 'election', 'crypto'])
-    
-    def _do_override(new_strategy: str, reason: str):
-        if predicted not in data.get("secondary_strategies", []):
-            data.setdefault("secondary_strategies", []).append(predicted)
-        data["primary_strategy"] = new_strategy
-        data["evidence"] = data.get("evidence", []) + [reason]
-    
+
+    def __init__(self, predicted: str, sizing, flow, markets, num_positions: int, profile=None,
+                 precomputed: dict | None = None):
+        self.predicted = predicted
+        self.num_positions = num_positions
+        self.avg_pos = sizing.avg_position_size
+        self.cv = sizing.coefficient_of_variation
+        self.win_rate = getattr(flow, 'win_rate', None) or 0.5
+        self.profit_factor = getattr(flow, 'profit_factor', None) or 1.0
+        self.edge = self.win_rate - 0.5
+        self.sharpe = getattr(profile, 'sharpe_score', None) if profile else None
+        self.avg_entry = getattr(sizing, 'avg_entry_price', 0.5)
+        self.low_odds_pct = getattr(sizing, 'low_odds_pct', 0)
+        self.low_entry = self.avg_entry < 0.45 or self.low_odds_pct > 0.30
+        self._markets = markets
+        self._precomputed = precomputed
+
+    @cached_property
+    def _categories(self) -> dict:
+        return self._precomputed if self._precomputed is not None else _category_summary(self._markets)
+
+    def __getitem__(self, name: str):
+        # Mapping access so message templates can be rendered with str.format_map(ctx)
+        return getattr(self, name)
+
+    def _top_share(self, kind: str) -> float:
+        """Share of positions in the top category if it is of `kind`, else 0."""
+        top_cats = self._categories["top_cats"]
+        if not top_cats or _cat_kind(top_cats[0]) != kind:
+            return 0
+        return self._categories["cat_values"][0] / self._categories["total_cat"]
+
+    def _kind_share(self, kind: str) -> float:
+        cat_counts = getattr(self._markets, 'category_counts', {})
+        return sum(v for c, v in cat_counts.items() if _cat_kind(c) == kind) / self._categories["total_cat"]
+
+    @cached_property
+    def sports_dominant(self) -> bool:
+        return self._top_share('sports') > 0.40
+
+    @cached_property
+    def crypto_dominant(self) -> bool:
+        return self._top_share('crypto') > 0.60
+
+    @cached_property
+    def has_politics_news(self) -> bool:
+        top = str(self._categories["top_cats"]).lower()
+        return any(c in top for c in ['politic', 'news', 'election', 'crypto'])
+
+    @cached_property
+    def politics_pct(self) -> float:
+        return self._kind_share('politics')
+
+    @cached_property
+    def crypto_pct(self) -> float:
+        return self._kind_share('crypto')
+
+
+@dataclass(frozen=True)
+class OverrideRule:
+    """A post-classification override: relabel as `target` when `applies(ctx)` holds.
+
+    `on` / `not_on` restrict which current labels the rule is considered for at all
+    (None = any label); rules are dispatched by label, so `applies` never sees others.
+    """
+    name: str
+    target: str
+    applies: Callable[[OverrideContext], bool]
+    msg: str  # str.format_map template over OverrideContext attributes
+    on: tuple[str, ...] | None = None
+    not_on: tuple[str, ...] = ()
+
+    def fires_on(self, label: str) -> bool:
+        return (self.on is None or label in self.on) and label not in self.not_on
+
+
+def _is_exceptional(c: OverrideContext) -> bool:
+    return c.win_rate > 0.75 or c.profit_factor > 3.0
+
+
+def _has_news_signal(c: OverrideContext) -> bool:
+    return c.profit_factor > 1.1 and c.low_entry and c.politics_pct > 0.25
+
+
+def _small_whale_alternative(c: OverrideContext) -> str | None:
+    """Pick the replacement tier for a small-position, high-count 'whale'."""
+    if not (c.avg_pos < 10_000 and c.num_positions > 3000):
+        return None
+    if c.num_positions > 20_000 and abs(c.edge) < 0.03:
+        return "market_maker"
+    if c.num_positions > 2000 and c.edge > 0.03 and c.cv < 1.5:
+        return "model_based"
+    if c.num_positions > 5000 and 0.03 < c.edge < 0.15:
+        return "scalper"
+    return "too_small"
+
+
+def _thin_edge_at_scale(c: OverrideContext) -> bool:
+    return (c.num_positions > 30_000 and c.avg_pos < 150_000
+            and abs(c.edge) < 0.02 and c.profit_factor < 1.10)
+
+
+def _sports_scalper_tier1(c: OverrideContext) -> bool:
+    return c.avg_pos < 10_000 and 0.02 < c.edge < 0.08 and c.profit_factor < 1.3
+
+
+# Evaluated in order against the LLM's label. Rules do not short-circuit: a later
+# match supersedes an earlier one, and every fired rule adds its reason to evidence.
+# Within a rule, scalar gates come before category aggregates (lazy on OverrideContext).
+OVERRIDE_RULES: list[OverrideRule] = [
     # === SPORTS WHALE OVERRIDE ===
     # Sports + large positions + low count = whale, even with high win rate
     # Sports bettors don't have "information edge" — they have skill or luck
     # Two triggers: (1) high CV or (2) very large avg ($300K+) or (3) negative Sharpe
-    is_sports_whale = (
-        predicted != "whale" and avg_pos > 50_000 and num_positions < 5000 and sports_dominant
-        and (cv > 1.5 or avg_pos > 300_000 or (sharpe is not None and sharpe < 0))
-    )
-    if is_sports_whale:
-        _do_override("whale",
-            f"OVERRIDE {predicted}→whale: avg ${avg_pos:,.0f}, {num_positions} positions, "
-            f"CV {cv:.2f}, Sharpe {sharpe}, SPORTS-DOMINANT markets. "
-            f"Large sports bettors are whales regardless of win rate.")
-    
+    OverrideRule(
+        "sports_whale", "whale",
+        lambda c: (c.avg_pos > 50_000 and c.num_positions < 5000
+                   and (c.cv > 1.5 or c.avg_pos > 300_000 or (c.sharpe is not None and c.sharpe < 0))
+                   and c.sports_dominant),
+        ("OVERRIDE {predicted}→whale: avg ${avg_pos:,.0f}, {num_positions} positions, "
+         "CV {cv:.2f}, Sharpe {sharpe}, SPORTS-DOMINANT markets. "
+         "Large sports bettors are whales regardless of win rate."),
+        not_on=("whale",),
+    ),
     # === GENERAL WHALE OVERRIDE (non-sports, conservative) ===
     # Only for very large positions + few trades + weak edge + NOT politics/news
-    if predicted != "whale" and avg_pos > 300_000 and num_positions < 2500 and not has_politics_news:
-        if win_rate < 0.55 or (sharpe is not None and sharpe < 0):
-            _do_override("whale",
-                f"OVERRIDE {predicted}→whale: avg ${avg_pos:,.0f}, {num_positions} positions, "
-                f"win rate {win_rate:.0%}, Sharpe {sharpe} — large bets without edge, not politics/news")
-    
+    OverrideRule(
+        "general_whale", "whale",
+        lambda c: (c.avg_pos > 300_000 and c.num_positions < 2500
+                   and (c.win_rate < 0.55 or (c.sharpe is not None and c.sharpe < 0)) and not c.has_politics_news),
+        ("OVERRIDE {predicted}→whale: avg ${avg_pos:,.0f}, {num_positions} positions, "
+         "win rate {win_rate:.0%}, Sharpe {sharpe} — large bets without edge, not politics/news"),
+        not_on=("whale",),
+    ),
     # === INFO_EDGE RESCUE ===
     # If classified as whale but trades politics/news/crypto → info_edge
     # Two tiers:
@@ -435,271 +566,353 @@ def _apply_hard_overrides(data: dict, sizing, flow, markets, num_positions: int,
     #   2. Politics-HEAVY focus (>30% of positions) + profitable + low entry prices → rescue
     #      Info_edge traders often have moderate WR because they take many positions,
     #      but their real signal is MARKET SELECTION (news/politics events) + early entry.
-    if predicted == "whale" and has_politics_news and not sports_dominant:
-        politics_count = sum(v for c, v in cat_counts.items() if any(kw in str(c).lower() for kw in ['politic', 'news', 'election']))
-        politics_pct = politics_count / total_cat if total_cat > 0 else 0
-        low_entry = getattr(sizing, 'avg_entry_price', 0.5) < 0.45 or getattr(sizing, 'low_odds_pct', 0) > 0.30
-        
-        if win_rate > 0.75 or profit_factor > 3.0:
-            _do_override("info_edge",
-                f"OVERRIDE whale→info_edge: win rate {win_rate:.0%}, PF {profit_factor:.1f}, "
-                f"trades politics/news/crypto markets — exceptional accuracy suggests information advantage")
-        elif politics_pct > 0.25 and profit_factor > 1.1 and low_entry:
-            _do_override("info_edge",
-                f"OVERRIDE whale→info_edge: {politics_pct:.0%} politics/news markets, "
-                f"PF {profit_factor:.1f}, avg entry {getattr(sizing, 'avg_entry_price', 'N/A'):.2f}, "
-                f"low-odds {getattr(sizing, 'low_odds_pct', 0):.0%}. "
-                f"News-focused + early entry + profitable = information edge trader")
-    
+    OverrideRule(
+        "info_edge_rescue_exceptional", "info_edge",
+        lambda c: _is_exceptional(c) and c.has_politics_news and not c.sports_dominant,
+        ("OVERRIDE whale→info_edge: win rate {win_rate:.0%}, PF {profit_factor:.1f}, "
+         "trades politics/news/crypto markets — exceptional accuracy suggests information advantage"),
+        on=("whale",),
+    ),
+    OverrideRule(
+        "info_edge_rescue_news", "info_edge",
+        lambda c: (c.profit_factor > 1.1 and c.low_entry and not _is_exceptional(c)
+                   and c.has_politics_news and not c.sports_dominant and c.politics_pct > 0.25),
+        ("OVERRIDE whale→info_edge: {politics_pct:.0%} politics/news markets, "
+         "PF {profit_factor:.1f}, avg entry {avg_entry:.2f}, "
+         "low-odds {low_odds_pct:.0%}. "
+         "News-focused + early entry + profitable = information edge trader"),
+        on=("whale",),
+    ),
     # === MODEL_BASED RESCUE ===
     # If classified as whale but has high trade count + consistent edge → model_based
-    if predicted == "whale" and num_positions > 500 and cv < 1.2:
-        if win_rate > 0.55 and profit_factor > 1.2:
-            _do_override("model_based",
-                f"OVERRIDE whale→model_based: {num_positions} positions, CV {cv:.2f}, "
-                f"win rate {win_rate:.0%}, PF {profit_factor:.1f} — too consistent for whale")
-    
+    OverrideRule(
+        "model_rescue", "model_based",
+        lambda c: (c.num_positions > 500 and c.cv < 1.2
+                   and c.win_rate > 0.55 and c.profit_factor > 1.2),
+        ("OVERRIDE whale→model_based: {num_positions} positions, CV {cv:.2f}, "
+         "win rate {win_rate:.0%}, PF {profit_factor:.1f} — too consistent for whale"),
+        on=("whale",),
+    ),
     # === MODEL_BASED RESCUE (sports-specific, relaxed CV) ===
     # Sports model traders can have high CV from occasional large bets while core behavior
     # is systematic. Key signals: high position count + consistent win rate + sports focus.
     # CV is less informative for sports models because occasional big bets inflate it.
-    if predicted == "whale" and sports_dominant and num_positions > 2000:
-        if win_rate > 0.58 and profit_factor > 1.05 and avg_pos < 50_000:
-            _do_override("model_based",
-                f"OVERRIDE whale→model_based: sports-dominant, {num_positions} positions, "
-                f"WR {win_rate:.0%}, PF {profit_factor:.1f}, avg ${avg_pos:,.0f}. "
-                f"High position count + consistent edge in sports = quantitative model. "
-                f"CV {cv:.2f} inflated by outlier positions, not indicative of whale behavior.")
-    
+    OverrideRule(
+        "model_rescue_sports", "model_based",
+        lambda c: (c.num_positions > 2000
+                   and c.win_rate > 0.58 and c.profit_factor > 1.05 and c.avg_pos < 50_000 and c.sports_dominant),
+        ("OVERRIDE whale→model_based: sports-dominant, {num_positions} positions, "
+         "WR {win_rate:.0%}, PF {profit_factor:.1f}, avg ${avg_pos:,.0f}. "
+         "High position count + consistent edge in sports = quantitative model. "
+         "CV {cv:.2f} inflated by outlier positions, not indicative of whale behavior."),
+        on=("whale",),
+    ),
     # === MODEL_BASED RESCUE (strong Sharpe, moderate count) ===
-    # A sports trader with fewer positions (500-2000) but exceptional Sharpe (>0.8) and 
+    # A sports trader with fewer positions (500-2000) but exceptional Sharpe (>0.8) and
     # strong win rate is using a quantitative model, not blindly whale-betting.
     # Whales have inconsistent returns; high Sharpe = systematic edge.
-    if predicted == "whale" and sports_dominant and 500 <= num_positions <= 2000:
-        if sharpe is not None and sharpe > 0.8 and win_rate > 0.60:
-            _do_override("model_based",
-                f"OVERRIDE whale→model_based: sports, {num_positions} positions, "
-                f"Sharpe {sharpe:.2f} (>0.8), WR {win_rate:.0%}. "
-                f"High Sharpe + strong win rate = consistent quantitative edge, not whale.")
-    
+    OverrideRule(
+        "model_rescue_sharpe", "model_based",
+        lambda c: (500 <= c.num_positions <= 2000
+                   and c.sharpe is not None and c.sharpe > 0.8 and c.win_rate > 0.60 and c.sports_dominant),
+        ("OVERRIDE whale→model_based: sports, {num_positions} positions, "
+         "Sharpe {sharpe:.2f} (>0.8), WR {win_rate:.0%}. "
+         "High Sharpe + strong win rate = consistent quantitative edge, not whale."),
+        on=("whale",),
+    ),
     # === MODEL_BASED RESCUE (sports, moderate count, strong edge without Sharpe) ===
     # Sports traders with 500-2000 positions, strong win rate (>60%), and meaningful
     # profit factor (>1.2) have a quantitative edge — not just whale-betting.
     # Whales bet big without consistent edge; these traders have repeatable alpha.
-    if predicted == "whale" and sports_dominant and 500 <= num_positions <= 2000:
-        if win_rate > 0.60 and profit_factor > 1.2 and avg_pos < 100_000:
-            _do_override("model_based",
-                f"OVERRIDE whale→model_based: sports, {num_positions} positions, "
-                f"WR {win_rate:.0%} (>60%), PF {profit_factor:.1f} (>1.2), avg ${avg_pos:,.0f}. "
-                f"Moderate position count + strong consistent edge = quantitative sports model, "
-                f"not whale. Whales bet big WITHOUT edge; this trader has repeatable alpha.")
-    
+    OverrideRule(
+        "model_rescue_sports_edge", "model_based",
+        lambda c: (500 <= c.num_positions <= 2000
+                   and c.win_rate > 0.60 and c.profit_factor > 1.2 and c.avg_pos < 100_000 and c.sports_dominant),
+        ("OVERRIDE whale→model_based: sports, {num_positions} positions, "
+         "WR {win_rate:.0%} (>60%), PF {profit_factor:.1f} (>1.2), avg ${avg_pos:,.0f}. "
+         "Moderate position count + strong consistent edge = quantitative sports model, "
+         "not whale. Whales bet big WITHOUT edge; this trader has repeatable alpha."),
+        on=("whale",),
+    ),
     # === ANTI-WHALE: Small avg position + high count = NOT whale ===
-    # Whales have large positions. If avg < $10K and many positions, it's model_based/scalper/MM
-    if predicted == "whale" and avg_pos < 10_000 and num_positions > 3000:
-        # Determine best alternative based on edge and count
-        edge = win_rate - 0.5
-        if num_positions > 20_000 and abs(edge) < 0.03:
-            new_strat = "market_maker"
-            reason = f"OVERRIDE whale→market_maker: avg ${avg_pos:,.0f} (<$10K), {num_positions} positions (>20K), edge {edge:.1%} — too small and numerous for whale"
-        elif num_positions > 2000 and edge > 0.03 and cv < 1.5:
-            new_strat = "model_based"
-            reason = f"OVERRIDE whale→model_based: avg ${avg_pos:,.0f} (<$10K), {num_positions} positions, win rate {win_rate:.0%}, CV {cv:.2f} — systematic small positions, not whale"
-        elif num_positions > 5000 and 0.03 < edge < 0.15:
-            new_strat = "scalper"
-            reason = f"OVERRIDE whale→scalper: avg ${avg_pos:,.0f} (<$10K), {num_positions} positions, win rate {win_rate:.0%} — high-frequency small bets with moderate edge"
-        else:
-            new_strat = "model_based"
-            reason = f"OVERRIDE whale→model_based: avg ${avg_pos:,.0f} (<$10K), {num_positions} positions — too small for whale"
-        _do_override(new_strat, reason)
-    
+    # Whales have large positions. If avg < $10K and many positions, it's model_based/scalper/MM;
+    # the best alternative depends on edge and count.
+    OverrideRule(
+        "anti_whale_small_mm", "market_maker",
+        lambda c: _small_whale_alternative(c) == "market_maker",
+        ("OVERRIDE whale→market_maker: avg ${avg_pos:,.0f} (<$10K), {num_positions} positions (>20K), "
+         "edge {edge:.1%} — too small and numerous for whale"),
+        on=("whale",),
+    ),
+    OverrideRule(
+        "anti_whale_small_model", "model_based",
+        lambda c: _small_whale_alternative(c) == "model_based",
+        ("OVERRIDE whale→model_based: avg ${avg_pos:,.0f} (<$10K), {num_positions} positions, "
+         "win rate {win_rate:.0%}, CV {cv:.2f} — systematic small positions, not whale"),
+        on=("whale",),
+    ),
+    OverrideRule(
+        "anti_whale_small_scalper", "scalper",
+        lambda c: _small_whale_alternative(c) == "scalper",
+        ("OVERRIDE whale→scalper: avg ${avg_pos:,.0f} (<$10K), {num_positions} positions, "
+         "win rate {win_rate:.0%} — high-frequency small bets with moderate edge"),
+        on=("whale",),
+    ),
+    OverrideRule(
+        "anti_whale_small_other", "model_based",
+        lambda c: _small_whale_alternative(c) == "too_small",
+        ("OVERRIDE whale→model_based: avg ${avg_pos:,.0f} (<$10K), {num_positions} positions "
+         "— too small for whale"),
+        on=("whale",),
+    ),
     # === ANTI-WHALE: Medium avg but very high count ===
     # Even with avg $10K-$50K, if position count is very high (>10K), it's not whale behavior
-    if predicted == "whale" and avg_pos < 50_000 and num_positions > 10_000:
-        edge = win_rate - 0.5
-        if edge > 0.03 and cv < 2.0:
-            _do_override("model_based",
-                f"OVERRIDE whale→model_based: {num_positions} positions (>10K) with avg ${avg_pos:,.0f} (<$50K), "
-                f"win rate {win_rate:.0%}, CV {cv:.2f} — high-frequency systematic trading, not whale")
-    
+    OverrideRule(
+        "anti_whale_medium", "model_based",
+        lambda c: (c.avg_pos < 50_000 and c.num_positions > 10_000
+                   and c.edge > 0.03 and c.cv < 2.0),
+        ("OVERRIDE whale→model_based: {num_positions} positions (>10K) with avg ${avg_pos:,.0f} (<$50K), "
+         "win rate {win_rate:.0%}, CV {cv:.2f} — high-frequency systematic trading, not whale"),
+        on=("whale",),
+    ),
     # === MODEL_BASED → INFO_EDGE for politics/news-heavy wallets with early entry ===
     # Model_based is systematic quant trading; info_edge is news/event-driven with timing advantage.
     # Key distinction: politics/news markets + low entry prices = getting in early on events they KNOW about.
-    if predicted == "model_based" and has_politics_news and not sports_dominant:
-        politics_count = sum(v for c, v in cat_counts.items() if any(kw in str(c).lower() for kw in ['politic', 'news', 'election']))
-        politics_pct = politics_count / total_cat if total_cat > 0 else 0
-        low_entry = getattr(sizing, 'avg_entry_price', 0.5) < 0.45 or getattr(sizing, 'low_odds_pct', 0) > 0.30
-        if politics_pct > 0.25 and low_entry and profit_factor > 1.1:
-            _do_override("info_edge",
-                f"OVERRIDE model_based→info_edge: {politics_pct:.0%} politics/news markets, "
-                f"avg entry {getattr(sizing, 'avg_entry_price', 'N/A'):.2f}, "
-                f"low-odds {getattr(sizing, 'low_odds_pct', 0):.0%}, PF {profit_factor:.1f}. "
-                f"News-focused + early entry = information edge, not systematic quant model.")
-
+    OverrideRule(
+        "model_to_info_edge", "info_edge",
+        lambda c: (c.profit_factor > 1.1 and c.low_entry
+                   and c.has_politics_news and not c.sports_dominant and c.politics_pct > 0.25),
+        ("OVERRIDE model_based→info_edge: {politics_pct:.0%} politics/news markets, "
+         "avg entry {avg_entry:.2f}, "
+         "low-odds {low_odds_pct:.0%}, PF {profit_factor:.1f}. "
+         "News-focused + early entry = information edge, not systematic quant model."),
+        on=("model_based",),
+    ),
     # === INFO_EDGE → MODEL_BASED for high position count or moderate edge ===
     # True info_edge traders have EXCEPTIONAL accuracy (WR >75% or PF >3.0) on few bets
     # Model_based traders have MODERATE but consistent edge across many positions
     # EXCEPTION: politics/news-heavy wallets with early entry ARE info_edge even with many positions
     #   Info_edge traders on Polymarket can take thousands of positions across news events.
     #   The key signal is MARKET SELECTION (politics/news) + EARLY ENTRY (low prices), not position count.
-    if predicted == "info_edge" and not sports_dominant:
-        is_exceptional = win_rate > 0.75 or profit_factor > 3.0
-        politics_count_ie = sum(v for c, v in cat_counts.items() if any(kw in str(c).lower() for kw in ['politic', 'news', 'election']))
-        politics_pct_ie = politics_count_ie / total_cat if total_cat > 0 else 0
-        low_entry_ie = getattr(sizing, 'avg_entry_price', 0.5) < 0.45 or getattr(sizing, 'low_odds_pct', 0) > 0.30
-        has_news_signal = politics_pct_ie > 0.25 and low_entry_ie and profit_factor > 1.1
-        
-        if not is_exceptional and not has_news_signal and num_positions > 500:
-            _do_override("model_based",
-                f"OVERRIDE info_edge→model_based: {num_positions} positions with WR {win_rate:.0%}, "
-                f"PF {profit_factor:.1f}. True info_edge has exceptional accuracy (WR>75% or PF>3.0) "
-                f"or strong politics/news focus with early entry. "
-                f"This is moderate consistent edge across many positions = systematic/quantitative.")
-    
+    OverrideRule(
+        "info_edge_to_model", "model_based",
+        lambda c: (c.num_positions > 500 and not _is_exceptional(c)
+                   and not c.sports_dominant and not _has_news_signal(c)),
+        ("OVERRIDE info_edge→model_based: {num_positions} positions with WR {win_rate:.0%}, "
+         "PF {profit_factor:.1f}. True info_edge has exceptional accuracy (WR>75% or PF>3.0) "
+         "or strong politics/news focus with early entry. "
+         "This is moderate consistent edge across many positions = systematic/quantitative."),
+        on=("info_edge",),
+    ),
     # === CONTRARIAN DETECTION ===
     # Contrarian traders bet against consensus. Key signals:
     # - Crypto-focused (price prediction markets: "dip to", "above", "below")
     # - Entry prices near 0.50 (buying when market is uncertain/split)
     # - Moderate edge, both sides of directional bets
     # - NOT sports-dominant (sports has clear favorites, not contrarian plays)
-    crypto_cats = sum(v for c, v in cat_counts.items() if 'crypto' in str(c).lower())
-    crypto_pct = crypto_cats / total_cat if total_cat > 0 else 0
-    avg_entry = getattr(sizing, 'avg_entry_price', 0.5)
-    
-    if predicted in ("scalper", "model_based", "hedger") and not sports_dominant and crypto_pct > 0.60:
-        # Crypto-specialist with entry near 0.50 = contrarian (betting against market consensus)
-        if 0.45 <= avg_entry <= 0.55 and 500 < num_positions < 5000:
-            _do_override("contrarian",
-                f"OVERRIDE {predicted}→contrarian: {crypto_pct:.0%} crypto markets, "
-                f"avg entry {avg_entry:.2f} (near 0.50 = buying at uncertainty), "
-                f"{num_positions} positions. Crypto price prediction specialist "
-                f"entering at consensus-split prices = contrarian strategy.")
-    
+    # Crypto-specialist with entry near 0.50 = contrarian (betting against market consensus)
+    OverrideRule(
+        "crypto_contrarian", "contrarian",
+        lambda c: (500 < c.num_positions < 5000
+                   and 0.45 <= c.avg_entry <= 0.55 and c.crypto_pct > 0.60 and not c.sports_dominant),
+        ("OVERRIDE {predicted}→contrarian: {crypto_pct:.0%} crypto markets, "
+         "avg entry {avg_entry:.2f} (near 0.50 = buying at uncertainty), "
+         "{num_positions} positions. Crypto price prediction specialist "
+         "entering at consensus-split prices = contrarian strategy."),
+        on=("scalper", "model_based", "hedger"),
+    ),
+]
+
+# Evaluated after OVERRIDE_RULES, against the label those rules left behind.
+POST_OVERRIDE_RULES: list[OverrideRule] = [
     # === HEDGER → CONTRARIAN for crypto-dominant with near-0.50 entry ===
     # Correlation analyzer adds hedging signals for crypto traders who take both sides
     # of price prediction markets, but this is contrarian behavior, not hedging.
-    predicted = data.get("primary_strategy", "unknown")  # refresh after prior overrides
-    if predicted == "hedger" and crypto_pct > 0.60 and not sports_dominant:
-        if 0.40 <= avg_entry <= 0.55 and 200 < num_positions < 10_000:
-            _do_override("contrarian",
-                f"OVERRIDE hedger→contrarian: {crypto_pct:.0%} crypto markets, "
-                f"avg entry {avg_entry:.2f} (near 0.50 = buying at uncertainty), "
-                f"{num_positions} positions. Crypto price prediction specialist with "
-                f"opposing positions is CONTRARIAN (betting against consensus), not hedger.")
-    
+    OverrideRule(
+        "hedger_to_contrarian", "contrarian",
+        lambda c: (200 < c.num_positions < 10_000
+                   and 0.40 <= c.avg_entry <= 0.55 and c.crypto_pct > 0.60 and not c.sports_dominant),
+        ("OVERRIDE hedger→contrarian: {crypto_pct:.0%} crypto markets, "
+         "avg entry {avg_entry:.2f} (near 0.50 = buying at uncertainty), "
+         "{num_positions} positions. Crypto price prediction specialist with "
+         "opposing positions is CONTRARIAN (betting against consensus), not hedger."),
+        on=("hedger",),
+    ),
     # === INFO_EDGE → MODEL_BASED for sports-dominant ===
     # Info_edge requires politics/news/crypto markets. Sports with consistent edge = model_based.
-    if predicted == "info_edge" and sports_dominant:
-        if win_rate > 0.55 and profit_factor > 1.1:
-            _do_override("model_based",
-                f"OVERRIDE info_edge→model_based: sports-dominant markets with WR {win_rate:.0%}, "
-                f"PF {profit_factor:.1f}. Info_edge requires politics/news/crypto where early "
-                f"information matters. Sports edge comes from quantitative models, not insider info.")
-    
+    OverrideRule(
+        "info_edge_to_model_sports", "model_based",
+        lambda c: c.win_rate > 0.55 and c.profit_factor > 1.1 and c.sports_dominant,
+        ("OVERRIDE info_edge→model_based: sports-dominant markets with WR {win_rate:.0%}, "
+         "PF {profit_factor:.1f}. Info_edge requires politics/news/crypto where early "
+         "information matters. Sports edge comes from quantitative models, not insider info."),
+        on=("info_edge",),
+    ),
     # === SCALPER → MODEL_BASED for sports with strong edge ===
-    if predicted == "scalper" and sports_dominant and win_rate > 0.58:
-        _do_override("model_based",
-            f"OVERRIDE scalper→model_based: sports-dominant, WR {win_rate:.0%} (>58%), "
-            f"PF {profit_factor:.1f}. Strong consistent edge in sports = quantitative model, "
-            f"not just high-frequency scalping.")
-    
+    OverrideRule(
+        "scalper_to_model_sports", "model_based",
+        lambda c: c.win_rate > 0.58 and c.sports_dominant,
+        ("OVERRIDE scalper→model_based: sports-dominant, WR {win_rate:.0%} (>58%), "
+         "PF {profit_factor:.1f}. Strong consistent edge in sports = quantitative model, "
+         "not just high-frequency scalping."),
+        on=("scalper",),
+    ),
     # === SCALPER → MODEL_BASED for very high-count systematic sports trading ===
     # Scalpers are opportunistic; model_based is systematic. Key signals:
     # 1. Very high count + low CV = algorithmic
     # 2. Extremely high count (>20K) + sports + any positive edge = systematic quant model
     #    (nobody manually scalps 20K+ sports positions — that's an algorithm)
-    if predicted == "scalper" and sports_dominant and num_positions > 15_000:
-        if cv < 0.5:
-            _do_override("model_based",
-                f"OVERRIDE scalper→model_based: {num_positions} positions (>15K), CV {cv:.2f} (<0.5), "
-                f"sports-dominant. Extremely high volume + very consistent sizing = systematic "
-                f"quantitative model, not opportunistic scalping.")
-        elif num_positions > 20_000 and win_rate > 0.51 and profit_factor > 1.0:
-            _do_override("model_based",
-                f"OVERRIDE scalper→model_based: {num_positions} positions (>20K), "
-                f"sports-dominant, WR {win_rate:.0%}, PF {profit_factor:.1f}. "
-                f"Nobody manually scalps 20K+ sports bets — this volume requires "
-                f"algorithmic/quantitative execution. CV {cv:.2f} is high but irrelevant "
-                f"at this scale; the sheer volume indicates systematic model-based trading.")
-    
+    OverrideRule(
+        "scalper_to_model_low_cv", "model_based",
+        lambda c: c.num_positions > 15_000 and c.cv < 0.5 and c.sports_dominant,
+        ("OVERRIDE scalper→model_based: {num_positions} positions (>15K), CV {cv:.2f} (<0.5), "
+         "sports-dominant. Extremely high volume + very consistent sizing = systematic "
+         "quantitative model, not opportunistic scalping."),
+        on=("scalper",),
+    ),
+    OverrideRule(
+        "scalper_to_model_volume", "model_based",
+        lambda c: (c.num_positions > 20_000 and not c.cv < 0.5
+                   and c.win_rate > 0.51 and c.profit_factor > 1.0 and c.sports_dominant),
+        ("OVERRIDE scalper→model_based: {num_positions} positions (>20K), "
+         "sports-dominant, WR {win_rate:.0%}, PF {profit_factor:.1f}. "
+         "Nobody manually scalps 20K+ sports bets — this volume requires "
+         "algorithmic/quantitative execution. CV {cv:.2f} is high but irrelevant "
+         "at this scale; the sheer volume indicates systematic model-based trading."),
+        on=("scalper",),
+    ),
     # === MARKET_MAKER → MODEL_BASED for sports with real edge ===
-    if predicted == "market_maker" and sports_dominant:
-        edge = win_rate - 0.5
-        if edge > 0.03 and profit_factor > 1.05:
-            _do_override("model_based",
-                f"OVERRIDE market_maker→model_based: sports-dominant, WR {win_rate:.0%} "
-                f"(edge {edge:.1%}), PF {profit_factor:.1f}. Market makers have near-zero edge; "
-                f"this trader has directional edge from sports modeling.")
-    
+    OverrideRule(
+        "mm_to_model_sports", "model_based",
+        lambda c: c.edge > 0.03 and c.profit_factor > 1.05 and c.sports_dominant,
+        ("OVERRIDE market_maker→model_based: sports-dominant, WR {win_rate:.0%} "
+         "(edge {edge:.1%}), PF {profit_factor:.1f}. Market makers have near-zero edge; "
+         "this trader has directional edge from sports modeling."),
+        on=("market_maker",),
+    ),
     # === MARKET_MAKER → MODEL_BASED rescue for wallets with real directional edge ===
     # Market makers have near-zero edge (WR ~50%, PF ~1.0). If classified as market_maker
     # but has meaningful directional edge, it's model_based (systematic quant trading at scale)
-    if predicted == "market_maker" and win_rate > 0.53 and profit_factor > 1.05:
-        _do_override("model_based",
-            f"OVERRIDE market_maker→model_based: WR {win_rate:.0%}, PF {profit_factor:.1f}. "
-            f"Market makers have near-zero directional edge (WR ~50%). This trader has "
-            f"meaningful edge = systematic quantitative trading at high volume.")
-    
+    OverrideRule(
+        "mm_to_model_edge", "model_based",
+        lambda c: c.win_rate > 0.53 and c.profit_factor > 1.05,
+        ("OVERRIDE market_maker→model_based: WR {win_rate:.0%}, PF {profit_factor:.1f}. "
+         "Market makers have near-zero directional edge (WR ~50%). This trader has "
+         "meaningful edge = systematic quantitative trading at high volume."),
+        on=("market_maker",),
+    ),
     # === MODEL_BASED → SCALPER for sports with small positions ===
     # Sports traders with very high count but small avg position are scalpers, not model_based.
     # Model_based traders typically size positions more aggressively.
     # Two tiers: (1) tiny avg <$10K any count >10K, (2) moderate avg <$100K + very high count + moderate WR
-    if predicted == "model_based" and sports_dominant and num_positions > 10_000:
-        edge = win_rate - 0.5
-        if avg_pos < 10_000 and 0.02 < edge < 0.08 and profit_factor < 1.3:
-            _do_override("scalper",
-                f"OVERRIDE model_based→scalper: sports-dominant, {num_positions} positions, "
-                f"avg ${avg_pos:,.0f} (<$10K), WR {win_rate:.0%}, PF {profit_factor:.1f}. Very small position sizes + "
-                f"high frequency + moderate edge = scalper, not model_based.")
-        elif avg_pos < 100_000 and 0.03 < edge < 0.10 and num_positions > 15_000 and (sharpe is None or sharpe < 0.8):
-            _do_override("scalper",
-                f"OVERRIDE model_based→scalper: sports-dominant, {num_positions} positions (>15K), "
-                f"avg ${avg_pos:,.0f} (<$100K), WR {win_rate:.0%}, Sharpe {sharpe}. "
-                f"High-frequency moderate-size sports trading with moderate edge = scalper. "
-                f"Model_based implies systematic sizing optimization; scalpers focus on volume and turnover.")
-    
+    OverrideRule(
+        "model_to_scalper_small", "scalper",
+        lambda c: (c.num_positions > 10_000
+                   and _sports_scalper_tier1(c) and c.sports_dominant),
+        ("OVERRIDE model_based→scalper: sports-dominant, {num_positions} positions, "
+         "avg ${avg_pos:,.0f} (<$10K), WR {win_rate:.0%}, PF {profit_factor:.1f}. Very small position sizes + "
+         "high frequency + moderate edge = scalper, not model_based."),
+        on=("model_based",),
+    ),
+    OverrideRule(
+        "model_to_scalper_volume", "scalper",
+        lambda c: (c.num_positions > 15_000
+                   and not _sports_scalper_tier1(c) and c.avg_pos < 100_000 and 0.03 < c.edge < 0.10
+                   and (c.sharpe is None or c.sharpe < 0.8) and c.sports_dominant),
+        ("OVERRIDE model_based→scalper: sports-dominant, {num_positions} positions (>15K), "
+         "avg ${avg_pos:,.0f} (<$100K), WR {win_rate:.0%}, Sharpe {sharpe}. "
+         "High-frequency moderate-size sports trading with moderate edge = scalper. "
+         "Model_based implies systematic sizing optimization; scalpers focus on volume and turnover."),
+        on=("model_based",),
+    ),
     # === MARKET MAKER OVERRIDE (very tight) ===
     # Only override when: massive count + near-exactly-50% WR + very thin edge
     # EXCEPTION: crypto-dominant wallets with ~50% WR are more likely scalpers/arb
     # (e.g., Bitcoin Up/Down short-timeframe traders who profit from execution timing)
-    crypto_dominant = any('crypto' in str(c).lower() for c in top_cats[:1]) and len(top_cats) > 0 and (cat_values[0] / total_cat > 0.60 if cat_values else False)
-    if predicted != "market_maker" and num_positions > 30_000 and avg_pos < 150_000:
-        edge = abs(win_rate - 0.5)
-        if edge < 0.02 and profit_factor < 1.10:
-            if crypto_dominant:
-                # Crypto-focused near-50% WR = scalper/arb, not market maker
-                # They profit from execution timing on short-timeframe crypto markets
-                _do_override("scalper",
-                    f"OVERRIDE {predicted}→scalper: {num_positions} positions, "
-                    f"avg ${avg_pos:,.0f}, win rate {win_rate:.0%}, PF {profit_factor:.2f}, "
-                    f"CRYPTO-DOMINANT — short-timeframe crypto trading with execution edge, not market making")
-            else:
-                _do_override("market_maker",
-                    f"OVERRIDE {predicted}→market_maker: {num_positions} positions, "
-                    f"avg ${avg_pos:,.0f}, win rate {win_rate:.0%}, PF {profit_factor:.2f} — "
-                    f"razor-thin edge + massive volume = market maker")
-    
+    OverrideRule(
+        "crypto_scalper", "scalper",
+        lambda c: _thin_edge_at_scale(c) and c.crypto_dominant,
+        ("OVERRIDE {predicted}→scalper: {num_positions} positions, "
+         "avg ${avg_pos:,.0f}, win rate {win_rate:.0%}, PF {profit_factor:.2f}, "
+         "CRYPTO-DOMINANT — short-timeframe crypto trading with execution edge, not market making"),
+        not_on=("market_maker",),
+    ),
+    OverrideRule(
+        "market_maker", "market_maker",
+        lambda c: _thin_edge_at_scale(c) and not c.crypto_dominant,
+        ("OVERRIDE {predicted}→market_maker: {num_positions} positions, "
+         "avg ${avg_pos:,.0f}, win rate {win_rate:.0%}, PF {profit_factor:.2f} — "
+         "razor-thin edge + massive volume = market maker"),
+        not_on=("market_maker",),
+    ),
+]
+
+
+def _index_by_label(rules: list[OverrideRule]) -> Callable[[str], tuple[OverrideRule, ...]]:
+    """Return a cached lookup of the rules (in table order) that can fire on a given label."""
+    @lru_cache(maxsize=64)
+    def rules_for(label: str) -> tuple[OverrideRule, ...]:
+        return tuple(r for r in rules if r.fires_on(label))
+    return rules_for
+
+
+_override_rules_for = _index_by_label(OVERRIDE_RULES)
+_post_override_rules_for = _index_by_label(POST_OVERRIDE_RULES)
+
+
+def _apply_hard_overrides(data: dict, sizing, flow, markets, num_positions: int, profile=None,
+                         precomputed: dict | None = None, log_reasons: bool = True) -> dict:
+    """Override LLM classification when rule-based signals are unambiguous.
+
+    CONSERVATIVE: only override when signals are very clear to avoid false positives.
+    `precomputed` is the wallet's _category_summary(); computed here if not given.
+    With `log_reasons=False` the evidence entry is just the rule name, skipping the
+    message templates (for bulk runs that only need the final labels).
+    """
+    ctx = OverrideContext(data.get("primary_strategy", "unknown"), sizing, flow, markets, num_positions, profile,
+                          precomputed)
+
+    def _do_override(new_strategy: str, reason: str):
+        if ctx.predicted not in data.get("secondary_strategies", []):
+            data.setdefault("secondary_strategies", []).append(ctx.predicted)
+        data["primary_strategy"] = new_strategy
+        data["evidence"] = data.get("evidence", []) + [reason]
+
+    for rule in _override_rules_for(ctx.predicted):
+        if rule.applies(ctx):
+            _do_override(rule.target, rule.msg.format_map(ctx) if log_reasons else f"OVERRIDE {rule.name}")
+
+    ctx.predicted = data.get("primary_strategy", "unknown")  # refresh after prior overrides
+    for rule in _post_override_rules_for(ctx.predicted):
+        if rule.applies(ctx):
+            _do_override(rule.target, rule.msg.format_map(ctx) if log_reasons else f"OVERRIDE {rule.name}")
+
     return data
 
 
+_JUDGE_SCHEMA_HINT = json.dumps({
+    "strategy_correct": True,
+    "strategy_partial": False,
+    "evidence_matches": [],
+    "evidence_missed": [],
+    "false_claims": [],
+    "specificity_score": 0.5,
+    "confidence_appropriate": 0.7,
+    "reasoning": ""
+}, indent=2)
+_JUDGE_SYSTEM_MSG = (
+    f"You are an expert evaluator. Respond in valid JSON with EXACTLY these snake_case field names:\n{_JUDGE_SCHEMA_HINT}"
+)
+
+
 async def skilled_judge(prompt: str) -> JudgeAssessment:
     """Use LLM as judge."""
-    schema_hint = json.dumps({
-        "strategy_correct": True,
-        "strategy_partial": False,
-        "evidence_matches": [],
-        "evidence_missed": [],
-        "false_claims": [],
-        "specificity_score": 0.5,
-        "confidence_appropriate": 0.7,
-        "reasoning": ""
-    }, indent=2)
     messages = [
-        {"role": "system", "content": f"You are an expert evaluator. Respond in valid JSON with EXACTLY these snake_case field names:\n{schema_hint}"},
+        {"role": "system", "content": _JUDGE_SYSTEM_MSG},
         {"role": "user", "content": prompt},
     ]
     raw = await call_llm(messages, model=JUDGE_MODEL)
-    return JudgeAssessment(**json.loads(raw))
+    return JudgeAssessment.model_validate_json(raw)
 
 
 async def main():
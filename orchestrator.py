@@ -16,16 +16,23 @@ import json
 import sys
 from datetime import datetime, timezone
 
-from agent.executor.agent import run_analysis
-from agent.evaluator.agent import score_thesis, run_full_eval, detect_regression, load_ground_truth
-from agent.improver.agent import run_improvement_cycle, rollback_changes
-from agent.trainer.agent import generate_curriculum, load_current_curriculum
-from eval.models import EvalReport
 from config import EXECUTOR_MODEL, PERFORMANCE_DIR
 
+# Agent modules (and the LLM SDKs behind them) are imported inside each command,
+# so a subcommand only pays for the agents it actually uses.
+
 
 async def cmd_train():
     """Run one full training cycle: curriculum → analyze → eval → improve."""
+    from agent.executor.agent import run_analysis, executor_version
+    from agent.evaluator.agent import (
+        JUDGE_BATCH_SIZE, score_theses, run_full_eval, detect_regression, load_ground_truth,
+    )
+    from agent.improver.agent import run_improvement_cycle, rollback_changes
+    from agent.trainer.agent import generate_curriculum
+    from agent.llm import gather_limited
+    from eval.models import EvalReport
+
     print("=" * 60)
     print("🏋️  TRAINING CYCLE")
     print("=" * 60)
@@ -42,27 +49,49 @@ async def cmd_train():
         gt = load_ground_truth()
         wallets = [{"wallet": w, "username": gt[w].username} for w in gt]
 
-    # Step 2: Executor analyzes each wallet
-    print(f"\n🔍 Step 2: Executor analyzing {len(wallets)} wallets...")
-    theses = []
-    for i, entry in enumerate(wallets):
+    # Step 2 + 3: Executor analyzes each wallet while the Evaluator scores finished theses.
+    # Analyses stream through a queue into judge batches, so judging overlaps analysis.
+    print(f"\n🔍 Step 2: Executor analyzing {len(wallets)} wallets (scoring as they finish)...")
+    gt = load_ground_truth()
+    exec_ver = executor_version()
+    analyzed = {}  # (executor version, wallet) -> thesis, reused by the re-eval if code is unchanged
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def analyze_entry(i, entry):
         wallet = entry.get("wallet", entry) if isinstance(entry, dict) else entry
         username = entry.get("username", wallet[:12]) if isinstance(entry, dict) else wallet[:12]
-        print(f"   [{i+1}/{len(wallets)}] {username}...", end=" ", flush=True)
         try:
             thesis, logger = await run_analysis(wallet)
-            theses.append(thesis)
-            print(f"→ {thesis.primary_strategy.value} (conf: {thesis.confidence:.2f})")
         except Exception as e:
-            print(f"💥 {e}")
-
-    # Step 3: Evaluator scores results
-    print(f"\n📊 Step 3: Evaluating {len(theses)} theses...")
-    gt = load_ground_truth()
-    scores = []
-    for thesis in theses:
-        score = await score_thesis(thesis, gt)
-        scores.append(score)
+            print(f"   [{i+1}/{len(wallets)}] {username} 💥 {e}")
+            return
+        print(f"   [{i+1}/{len(wallets)}] {username} → {thesis.primary_strategy.value} (conf: {thesis.confidence:.2f})")
+        analyzed[(exec_ver, wallet)] = thesis
+        await queue.put(thesis)
+
+    async def produce():
+        # Wallet analyses are independent and I/O-bound, so run them concurrently
+        await gather_limited(analyze_entry(i, entry) for i, entry in enumerate(wallets))
+        await queue.put(done)
+
+    async def consume():
+        theses, batch, judging = [], [], []
+        while (thesis := await queue.get()) is not done:
+            theses.append(thesis)
+            batch.append(thesis)
+            if len(batch) == JUDGE_BATCH_SIZE:
+                judging.append(asyncio.create_task(score_theses(batch, gt)))
+                batch = []
+        if batch:
+            judging.append(asyncio.create_task(score_theses(batch, gt)))
+        batch_scores = await asyncio.gather(*judging)
+        return theses, [score for scores in batch_scores for score in scores]
+
+    _, (theses, scores) = await asyncio.gather(produce(), consume())
+
+    print(f"\n📊 Step 3: Evaluated {len(theses)} theses")
+    for thesis, score in zip(theses, scores):
         if thesis.wallet in gt:
             status = "✅" if score.strategy_correct else "❌"
             print(f"   {status} {thesis.wallet[:12]}: {score.composite_score:.3f} "
@@ -91,7 +120,13 @@ async def cmd_train():
 
     # Step 6: Re-eval after improvements
     print("\n🔄 Step 5: Re-evaluating after improvements...")
+    post_ver = executor_version()
+    if post_ver == exec_ver:
+        print("   Executor code unchanged — reusing theses from Step 2 where available")
+
     async def analyze_only(wallet):
+        if (post_ver, wallet) in analyzed:
+            return analyzed[(post_ver, wallet)]
         thesis, _ = await run_analysis(wallet)
         return thesis
 
@@ -126,6 +161,9 @@ async def cmd_loop(rounds: int = 5):
 
 async def cmd_eval():
     """Run eval suite only."""
+    from agent.executor.agent import run_analysis
+    from agent.evaluator.agent import run_full_eval
+
     print("📊 Running evaluation...")
     async def analyze_only(wallet):
         thesis, _ = await run_analysis(wallet)
@@ -138,24 +176,34 @@ async def cmd_eval():
 
 async def cmd_analyze(wallets: list[str]):
     """Analyze specific wallets."""
-    for wallet in wallets:
-        print(f"\n🔍 Analyzing {wallet}...")
+    from agent.executor.agent import run_analysis
+    from agent.llm import gather_limited
+
+    async def analyze_one(wallet):
         try:
             thesis, logger = await run_analysis(wallet)
-            print(f"   Strategy: {thesis.primary_strategy.value}")
-            print(f"   Confidence: {thesis.confidence:.2f}")
-            print(f"   Evidence:")
-            for e in thesis.evidence[:5]:
-                print(f"     - {e}")
-            print(f"   Reasoning: {thesis.reasoning[:300]}")
-            summary = logger.get_summary()
-            print(f"   Log: {summary['log_file']} ({summary['total_entries']} entries, {summary['elapsed_s']:.1f}s)")
         except Exception as e:
-            print(f"   💥 Failed: {e}")
+            print(f"\n🔍 {wallet}\n   💥 Failed: {e}")
+            return
+        # Printed in one go once finished so concurrent results don't interleave
+        print(f"\n🔍 {wallet}")
+        print(f"   Strategy: {thesis.primary_strategy.value}")
+        print(f"   Confidence: {thesis.confidence:.2f}")
+        print(f"   Evidence:")
+        for e in thesis.evidence[:5]:
+            print(f"     - {e}")
+        print(f"   Reasoning: {thesis.reasoning[:300]}")
+        summary = logger.get_summary()
+        print(f"   Log: {summary['log_file']} ({summary['total_entries']} entries, {summary['elapsed_s']:.1f}s)")
+
+    print(f"🔍 Analyzing {len(wallets)} wallets...")
+    await gather_limited(analyze_one(w) for w in wallets)
 
 
 async def cmd_improve():
     """Run one improvement cycle."""
+    from agent.improver.agent import run_improvement_cycle
+
     print("🧬 Running self-improvement cycle...")
     result = await run_improvement_cycle()
     print(f"   Analysis: {result.get('analysis', 'N/A')}")
@@ -167,6 +215,8 @@ async def cmd_improve():
 
 async def cmd_curriculum():
     """Generate curriculum only."""
+    from agent.trainer.agent import generate_curriculum
+
     print("📋 Generating training curriculum...")
     result = await generate_curriculum()
     print(f"   Skill gaps: {result.get('skill_gaps', [])}")
@@ -0,0 +1,62 @@
+"""Run every built-in analyzer over one wallet, sharing a single column extraction."""
+
+from __future__ import annotations
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+from ._position_arrays import PositionsSoA, to_soa
+from .timing_analyzer import analyze_timing
+from .sizing_analyzer import analyze_sizing
+from .market_analyzer import analyze_markets
+from .flow_analyzer import analyze_flow
+from .pattern_analyzer import analyze_patterns
+from .correlation_analyzer import analyze_correlations
+
+_CACHE_SIZE = 32
+_cache: OrderedDict[str, dict[str, object]] = OrderedDict()
+_cache_lock = threading.Lock()  # run_all is called from worker threads
+
+
+def _fingerprint(soa: PositionsSoA) -> str:
+    """Content hash of every column the analyzers read (exact, not a summary)."""
+    h = hashlib.sha256()
+    for col in (soa.tb, soa.pnl, soa.ts, soa.ap, soa.cid_codes, soa.outcome_codes, soa.title_codes):
+        h.update(col.tobytes())
+    for values in (soa.cids, soa.outcomes, soa.titles):
+        h.update("\0".join(values).encode())
+        h.update(b"\1")
+    return h.hexdigest()
+
+
+def run_all(positions: list[dict], use_cache: bool = True) -> dict[str, object]:
+    """Run all built-in analyzers on one shared to_soa(); keys match discover_skills() names.
+
+    Results for identical position data are reused from a small LRU cache (hits
+    return copies, so callers may mutate them); `use_cache=False` always recomputes.
+    """
+    soa = to_soa(positions)
+    key = _fingerprint(soa) if use_cache else None
+    if key is not None:
+        with _cache_lock:
+            cached = _cache.get(key)
+            if cached is not None:
+                _cache.move_to_end(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+    results = {
+        "timing_analysis": analyze_timing(positions, soa),
+        "sizing_analysis": analyze_sizing(positions, soa),
+        "markets_analysis": analyze_markets(positions, soa),
+        "flow_analysis": analyze_flow(positions, soa),
+        "patterns_analysis": analyze_patterns(positions, soa),
+        "correlations_analysis": analyze_correlations(positions, soa),
+    }
+    if key is not None:
+        with _cache_lock:
+            _cache[key] = copy.deepcopy(results)
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+    return results
@@ -0,0 +1,88 @@
+"""Column-wise (struct-of-arrays) view of a wallet's positions.
+
+Analyzers that accept a `soa` work on these NumPy columns instead of calling
+`p.get(...)` on every dict in every pass. String fields are factorized into
+integer codes (first-occurrence order) plus the list of distinct values, so
+grouping becomes `np.bincount` and per-string work (including case folding)
+runs once per distinct value. The stable time order (`ts_order`) is also
+computed once here, so no analyzer re-sorts by timestamp.
+Build it once per wallet with `to_soa()` and share it (see `_fused.run_all`).
+"""
+
+from __future__ import annotations
+from typing import NamedTuple
+
+import numpy as np
+
+# Side codes for the `side` column; the values double as yes/no bits (both sides == 3)
+SIDE_OTHER, SIDE_YES, SIDE_NO = 0, 1, 2
+_SIDES = {"yes": SIDE_YES, "no": SIDE_NO}
+
+
+class PositionsSoA(NamedTuple):
+    """Parallel per-position columns. Missing fields take the Position model defaults.
+
+    Columns stay 64-bit: float32 shifts reported dollar totals, and int32 codes
+    only add an upcast copy in every np.bincount / fancy index that consumes them.
+    """
+    tb: np.ndarray             # float64
+    pnl: np.ndarray            # float64
+    ts: np.ndarray             # int64
+    ts_order: np.ndarray       # int64 stable argsort of ts (time order)
+    ap: np.ndarray             # float64 average entry price
+    cid_codes: np.ndarray      # int64 index into cids
+    cids: list[str]            # distinct condition ids
+    outcome_codes: np.ndarray  # int64 index into outcomes
+    outcomes: list[str]        # distinct lowercased outcomes
+    side: np.ndarray           # int8 SIDE_YES / SIDE_NO / SIDE_OTHER
+    title_codes: np.ndarray    # int64 index into titles
+    titles: list[str]          # distinct titles
+    titles_lower: list[str]    # titles lowercased, parallel to titles
+
+    def outcome_code(self, outcome: str) -> int:
+        """Code of a lowercased outcome, or -1 if no position has it."""
+        try:
+            return self.outcomes.index(outcome)
+        except ValueError:
+            return -1
+
+
+def _codes(keys: dict, values: list) -> np.ndarray:
+    return np.fromiter((keys.setdefault(v, len(keys)) for v in values), dtype=np.int64, count=len(values))
+
+
+def to_soa(positions: list[dict]) -> PositionsSoA:
+    """Extract and factorize every column once."""
+    # One pass over the dicts, appending every field, then one conversion per column
+    tb, pnl, ts, ap, cid, outcome, title = [], [], [], [], [], [], []
+    for p in positions:
+        get = p.get
+        tb.append(get("tb", 0))
+        pnl.append(get("pnl", 0))
+        ts.append(get("ts", 0))
+        ap.append(get("ap", 0))
+        cid.append(get("cid", ""))
+        outcome.append(get("o", ""))
+        title.append(get("t", ""))
+
+    cid_keys: dict[str, int] = {}
+    title_keys: dict[str, int] = {}
+    cid_codes = _codes(cid_keys, cid)
+    title_codes = _codes(title_keys, title)
+
+    # Factorize raw outcomes, then fold case on the distinct values only
+    raw_keys: dict[str, int] = {}
+    raw_codes = _codes(raw_keys, outcome)
+    lower_keys: dict[str, int] = {}
+    fold = np.array([lower_keys.setdefault(o.lower(), len(lower_keys)) for o in raw_keys], dtype=np.int64)
+    outcome_codes = fold[raw_codes]
+    side = np.array([_SIDES.get(o, SIDE_OTHER) for o in lower_keys], dtype=np.int8)[outcome_codes]
+
+    ts_arr = np.array(ts, dtype=np.int64)
+    return PositionsSoA(
+        np.array(tb, dtype=np.float64), np.array(pnl, dtype=np.float64),
+        ts_arr, np.argsort(ts_arr, kind="stable"), np.array(ap, dtype=np.float64),
+        cid_codes, list(cid_keys),
+        outcome_codes, list(lower_keys), side,
+        title_codes, list(title_keys), [t.lower() for t in title_keys],
+    )
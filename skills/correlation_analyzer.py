@@ -1,9 +1,14 @@
 """Correlation analysis: cross-market hedging, paired positions, portfolio construction."""
 
 from __future__ import annotations
-from collections import defaultdict
+import re
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
+
+import numpy as np
+
+from ._position_arrays import SIDE_OTHER, SIDE_YES, PositionsSoA, to_soa
 
 
 @dataclass
@@ -56,164 +61,108 @@ class CorrelationAnalysis:
         return "\n".join(lines)
 
 
-def _normalize_title(title: str) -> str:
-    """Extract a root title for grouping related markets.
+_MONEY_RE = re.compile(r'\$[\d,]+k?')
+_YEAR_RE = re.compile(r'\d{4}')
+_DATE_RE = re.compile(r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\s+\d+')
+
+_SIMPLE_CATEGORY_RULES = [
+    ("sports", re.compile(r'\bvs\.?\s|\bvs\b|spread|moneyline|nfl|nba|mlb|nhl|ufc')),
+    ("politics", re.compile(r'president|election|trump|biden|congress|senate|democrat|republican')),
+    ("crypto", re.compile(r'bitcoin|eth|ethereum|crypto|btc|solana|token')),
+    ("economics", re.compile(r'fed\b|inflation|gdp|tariff|interest rate')),
+]
+
+# Below these sizes a section carries no usable signal, so it is skipped
+_MIN_POSITIONS = 5        # related groups, opposing pairs, category direction
+_MIN_FOR_TEMPORAL = 10    # temporal clustering
+_MIN_FOR_CONCURRENT = 20  # concurrent open markets sweep
+
+
+@lru_cache(maxsize=4096)
+def _normalize_title(title_lower: str) -> str:
+    """Extract a root title for grouping related markets from a lowercased title.
     
     E.g., "Will Bitcoin hit $100K by March?" and "Will Bitcoin hit $150K by March?"
     should share a common root.
     """
-    import re
-    t = title.lower().strip()
+    t = title_lower.strip()
     # Remove specific numbers/dates that differentiate variants
-    t = re.sub(r'\$[\d,]+k?', '$X', t)
-    t = re.sub(r'\d{4}', 'YYYY', t)
-    t = re.sub(r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\s+\d+', 'DATE', t)
+    t = _MONEY_RE.sub('$X', t)
+    t = _YEAR_RE.sub('YYYY', t)
+    t = _DATE_RE.sub('DATE', t)
     # Truncate to first ~60 chars for grouping
     return t[:60]
 
 
-def _simple_category(title: str) -> str:
-    """Quick category for direction analysis."""
-    import re
-    t = title.lower()
-    if re.search(r'\bvs\.?\s|\bvs\b|spread|moneyline|nfl|nba|mlb|nhl|ufc', t):
-        return "sports"
-    if re.search(r'president|election|trump|biden|congress|senate|democrat|republican', t):
-        return "politics"
-    if re.search(r'bitcoin|eth|ethereum|crypto|btc|solana|token', t):
-        return "crypto"
-    if re.search(r'fed\b|inflation|gdp|tariff|interest rate', t):
-        return "economics"
+@lru_cache(maxsize=4096)
+def _simple_category(title_lower: str) -> str:
+    """Quick category for direction analysis, from a lowercased title."""
+    for category, pattern in _SIMPLE_CATEGORY_RULES:
+        if pattern.search(title_lower):
+            return category
     return "other"
 
 
-def analyze_correlations(positions: list[dict]) -> CorrelationAnalysis:
-    """Analyze cross-market correlations, hedging, and portfolio construction.
-    
-    Args:
-        positions: List of position dicts with keys: tb, ap, cp, pnl, ts, t, cid, o
+def _open_market_counts(ts: np.ndarray, order: np.ndarray, cid_codes: np.ndarray, hold: int) -> np.ndarray:
+    """Number of open markets after each open/close event, in event order.
+
+    Each dated position opens its market at ts and closes it at ts + hold; events
+    run in (time, close-before-open) order, ties in ts-sorted position order.
+    A market is open iff its latest event was an open, so an event changes the
+    count only when it flips that state: no per-event set or Python loop.
+    `order` is the stable time order of ts.
     """
-    result = CorrelationAnalysis(total_positions=len(positions))
-    if not positions:
-        return result
+    order = order[ts[order] > 0]
+    if not len(order):
+        return np.zeros(0, dtype=np.int64)
+    # Interleave (open, close) per position, then stable-sort by (time, delta)
+    start = ts[order]
+    times = np.column_stack((start, start + hold)).ravel()
+    markets = np.repeat(cid_codes[order], 2)
+    is_open = np.tile(np.array([True, False]), len(order))
+    seq = np.argsort(times * 2 + is_open, kind="stable")
+    markets, is_open = markets[seq], is_open[seq]
 
-    # --- Basic grouping ---
-    by_market: dict[str, list[dict]] = defaultdict(list)
-    for p in positions:
-        cid = p.get("cid", "unknown")
-        by_market[cid].append(p)
-    result.unique_markets = len(by_market)
+    # Was each event's market already open, i.e. was its previous event an open?
+    by_market = np.argsort(markets, kind="stable")
+    was_open = np.zeros(len(seq), dtype=bool)
+    same = markets[by_market[1:]] == markets[by_market[:-1]]
+    was_open[by_market[1:]] = same & is_open[by_market[:-1]]
 
-    # --- Both-side detection (YES + NO in same market) ---
-    both_side_count = 0
-    for cid, mpositions in by_market.items():
-        outcomes = set(p.get("o", "").lower() for p in mpositions)
-        if "yes" in outcomes and "no" in outcomes:
-            both_side_count += 1
-    result.same_market_both_sides = both_side_count
-    result.hedge_ratio = both_side_count / max(len(by_market), 1)
+    step = (is_open & ~was_open).astype(np.int64) - (~is_open & was_open)
+    return np.cumsum(step)
 
-    # --- Temporal clustering ---
-    # Sort all positions by timestamp, find clusters of 3+ within 1 hour
-    sorted_positions = sorted(positions, key=lambda p: p.get("ts", 0))
-    clusters = []
-    current_cluster = []
-    for p in sorted_positions:
-        ts = p.get("ts", 0)
-        if not current_cluster:
-            current_cluster = [p]
-        elif ts - current_cluster[0].get("ts", 0) <= 3600:  # 1 hour window
-            current_cluster.append(p)
-        else:
-            if len(current_cluster) >= 3:
-                # Check it spans multiple markets
-                cluster_markets = set(cp.get("cid", "") for cp in current_cluster)
-                if len(cluster_markets) >= 2:
-                    clusters.append(current_cluster)
-            current_cluster = [p]
-    # Don't forget last cluster
-    if len(current_cluster) >= 3:
-        cluster_markets = set(cp.get("cid", "") for cp in current_cluster)
-        if len(cluster_markets) >= 2:
-            clusters.append(current_cluster)
-
-    result.temporal_clusters = len(clusters)
-    if clusters:
-        sizes = [len(c) for c in clusters]
-        result.avg_cluster_size = sum(sizes) / len(sizes)
-        result.max_cluster_size = max(sizes)
 
-    # --- Related market groups (shared title root) ---
-    title_groups: dict[str, list[dict]] = defaultdict(list)
-    for p in positions:
-        root = _normalize_title(p.get("t", ""))
-        title_groups[root].append(p)
+def _temporal_cluster_sizes(ts: np.ndarray, order: np.ndarray, cid_codes: np.ndarray,
+                            window: int, min_size: int) -> np.ndarray:
+    """Sizes of the time clusters that hold min_size+ positions across 2+ markets.
 
-    # Only count groups with 2+ distinct condition IDs
-    related_groups = {
-        root: plist for root, plist in title_groups.items()
-        if len(set(p.get("cid", "") for p in plist)) >= 2
-    }
-    result.related_market_groups = len(related_groups)
-    result.positions_in_related = sum(len(plist) for plist in related_groups.values())
-    result.related_pct = result.positions_in_related / max(len(positions), 1)
+    Walking positions in time order, a cluster starts at the first position not
+    yet clustered and takes every later one within `window` seconds of that start.
+    Each cluster's end is a searchsorted lookup, so the only Python loop is over
+    cluster starts; the multi-market check is a prefix count of market changes.
+    `order` is the stable time order of ts.
+    """
+    ts_sorted = ts[order]
+    ends = np.searchsorted(ts_sorted, ts_sorted + window, side="right").tolist()
+    starts = []
+    i = 0
+    while i < len(ends):
+        starts.append(i)
+        i = ends[i]
+    starts = np.array(starts, dtype=np.int64)
+    stops = np.append(starts[1:], len(ends))
 
-    # --- Opposing pairs within related groups ---
-    opposing = 0
-    for root, plist in related_groups.items():
-        # Group by condition ID
-        by_cid: dict[str, set] = defaultdict(set)
-        for p in plist:
-            by_cid[p.get("cid", "")].add(p.get("o", "").lower())
-        # Check if any pair has opposing directions
-        cids = list(by_cid.keys())
-        for i in range(len(cids)):
-            for j in range(i + 1, len(cids)):
-                outcomes_i = by_cid[cids[i]]
-                outcomes_j = by_cid[cids[j]]
-                # Opposing: YES in one, NO in another (or vice versa)
-                if ("yes" in outcomes_i and "no" in outcomes_j) or \
-                   ("no" in outcomes_i and "yes" in outcomes_j):
-                    opposing += 1
-    result.opposing_pairs = opposing
+    # changes[k]: market switches between consecutive sorted positions up to k
+    markets = cid_codes[order]
+    changes = np.concatenate(([0], np.cumsum(markets[1:] != markets[:-1])))
+    sizes = stops - starts
+    multi_market = changes[stops - 1] > changes[starts]
+    return sizes[(sizes >= min_size) & multi_market]
 
-    # --- Concurrent open markets estimation ---
-    # Use timestamps to estimate how many markets are "open" at peak
-    # Approximate: for each position, assume it's open for ~7 days (median hold)
-    HOLD_DAYS = 7 * 86400  # 7 days in seconds
-    events = []
-    for p in sorted_positions:
-        ts = p.get("ts", 0)
-        if ts > 0:
-            events.append((ts, 1, p.get("cid", "")))
-            events.append((ts + HOLD_DAYS, -1, p.get("cid", "")))
-    
-    if events:
-        events.sort(key=lambda e: (e[0], e[1]))
-        current_open: set = set()
-        max_open = 0
-        open_counts = []
-        for ts, delta, cid in events:
-            if delta > 0:
-                current_open.add(cid)
-            else:
-                current_open.discard(cid)
-            if len(current_open) > max_open:
-                max_open = len(current_open)
-            open_counts.append(len(current_open))
-        result.simultaneous_open_markets = max_open
-        result.avg_open_markets = sum(open_counts) / len(open_counts) if open_counts else 0
 
-    # --- Category direction analysis ---
-    cat_dir: dict[str, dict[str, int]] = defaultdict(lambda: {"yes": 0, "no": 0})
-    for p in positions:
-        cat = _simple_category(p.get("t", ""))
-        outcome = p.get("o", "").lower()
-        if outcome in ("yes", "no"):
-            cat_dir[cat][outcome] += 1
-    result.category_direction = dict(cat_dir)
-
-    # --- Signals ---
+def _add_signals(result: CorrelationAnalysis) -> None:
+    """Append interpretive signals derived from the computed fields."""
     if result.hedge_ratio > 0.15:
         result.signals.append(
             f"HEDGER: {result.hedge_ratio:.0%} of markets have both YES and NO positions — active hedging")
@@ -241,7 +190,7 @@ def analyze_correlations(positions: list[dict]) -> CorrelationAnalysis:
             f"PORTFOLIO_BUILDER: peak {result.simultaneous_open_markets} concurrent markets — active portfolio management")
     
     # Category direction consistency
-    for cat, dirs in cat_dir.items():
+    for cat, dirs in result.category_direction.items():
         y, n = dirs["yes"], dirs["no"]
         total = y + n
         if total >= 20:
@@ -251,4 +200,97 @@ def analyze_correlations(positions: list[dict]) -> CorrelationAnalysis:
                 result.signals.append(
                     f"DIRECTIONAL_{cat.upper()}: {bias:.0%} {side}-side in {cat} — strong directional conviction")
 
+
+def analyze_correlations(positions: list[dict], soa: PositionsSoA | None = None) -> CorrelationAnalysis:
+    """Analyze cross-market correlations, hedging, and portfolio construction.
+    
+    Args:
+        positions: List of position dicts with keys: tb, ap, cp, pnl, ts, t, cid, o
+        soa: Optional precomputed to_soa(positions), shared across analyzers
+    """
+    result = CorrelationAnalysis(total_positions=len(positions))
+    if not positions:
+        return result
+    if soa is None:
+        soa = to_soa(positions)
+
+    # --- Basic grouping ---
+    result.unique_markets = len(soa.cids)
+
+    # --- Both-side detection (YES + NO in same market) ---
+    # Per-position side bit (yes=1, no=2) OR-ed into its market: both sides == 3
+    bits = soa.side.astype(np.int64)
+    n_markets = len(soa.cids)
+    market_bits = np.zeros(n_markets, dtype=np.int64)
+    np.bitwise_or.at(market_bits, soa.cid_codes, bits)
+    both_side_count = int(np.count_nonzero(market_bits == 3))
+    result.same_market_both_sides = both_side_count
+    result.hedge_ratio = both_side_count / max(n_markets, 1)
+    if len(positions) < _MIN_POSITIONS:
+        _add_signals(result)
+        return result
+
+    # --- Temporal clustering ---
+    # Sort all positions by timestamp, find clusters of 3+ within 1 hour
+    if len(positions) >= _MIN_FOR_TEMPORAL:
+        sizes = _temporal_cluster_sizes(soa.ts, soa.ts_order, soa.cid_codes, window=3600, min_size=3)
+        result.temporal_clusters = len(sizes)
+        if len(sizes):
+            result.avg_cluster_size = int(sizes.sum()) / len(sizes)
+            result.max_cluster_size = int(sizes.max())
+
+    # --- Related market groups (shared title root) ---
+    # Group by (root, market) pair and OR the same outcome bits per distinct pair
+    root_keys: dict[str, int] = {}
+    title_root = np.array(
+        [root_keys.setdefault(_normalize_title(t), len(root_keys)) for t in soa.titles_lower], dtype=np.int64)
+    pos_root = title_root[soa.title_codes]
+    pairs, pair_idx = np.unique(pos_root * len(soa.cids) + soa.cid_codes, return_inverse=True)
+    pair_bits = np.zeros(len(pairs), dtype=np.int64)
+    np.bitwise_or.at(pair_bits, pair_idx, bits)
+    pair_root = pairs // len(soa.cids)
+
+    # Only count groups with 2+ distinct condition IDs
+    related = np.bincount(pair_root, minlength=len(root_keys)) >= 2
+    result.related_market_groups = int(related.sum())
+    result.positions_in_related = int(np.bincount(pos_root, minlength=len(root_keys))[related].sum())
+    result.related_pct = result.positions_in_related / max(len(positions), 1)
+
+    # --- Opposing pairs within related groups ---
+    # Opposing pair: YES in one market, NO in another (or vice versa). Count by
+    # class per root instead of checking every pair: yes-only/no-only/both markets
+    # oppose each other and any two both-side markets oppose. Single-market roots
+    # contribute nothing, so no need to filter on `related`.
+    y, n, b = (np.bincount(pair_root[pair_bits == k], minlength=len(root_keys)) for k in (1, 2, 3))
+    result.opposing_pairs = int((y * n + y * b + n * b + b * (b - 1) // 2).sum())
+
+    # --- Concurrent open markets estimation ---
+    # Use timestamps to estimate how many markets are "open" at peak
+    # Approximate: for each position, assume it's open for ~7 days (median hold)
+    HOLD_DAYS = 7 * 86400  # 7 days in seconds
+    if len(positions) >= _MIN_FOR_CONCURRENT:
+        open_counts = _open_market_counts(soa.ts, soa.ts_order, soa.cid_codes, HOLD_DAYS)
+        if len(open_counts):
+            result.simultaneous_open_markets = int(open_counts.max())
+            result.avg_open_markets = int(open_counts.sum()) / len(open_counts)
+
+    # --- Category direction analysis ---
+    # (category, side) counts from one bincount over the yes/no positions
+    cat_keys: dict[str, int] = {}
+    title_cat = np.array(
+        [cat_keys.setdefault(_simple_category(t), len(cat_keys)) for t in soa.titles_lower], dtype=np.int64)
+    sided = soa.side != SIDE_OTHER
+    cat_codes = title_cat[soa.title_codes[sided]]
+    counts = np.bincount(cat_codes * 2 + (soa.side[sided] - SIDE_YES), minlength=2 * len(cat_keys))
+    counts = counts.reshape(-1, 2).tolist()
+    # Categories appear in first-seen order among yes/no positions
+    seen, first = np.unique(cat_codes, return_index=True)
+    cats = list(cat_keys)
+    cat_dir = {
+        cats[c]: {"yes": counts[c][0], "no": counts[c][1]}
+        for c in seen[np.argsort(first)].tolist()
+    }
+    result.category_direction = cat_dir
+
+    _add_signals(result)
     return result
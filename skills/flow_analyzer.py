@@ -1,10 +1,12 @@
 """Flow analysis: buy/sell ratio, accumulation/distribution, directional bias."""
 
 from __future__ import annotations
-from datetime import datetime, timezone
-from collections import defaultdict
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from ._position_arrays import PositionsSoA, to_soa
+
 
 @dataclass
 class FlowAnalysis:
@@ -50,35 +52,40 @@ class FlowAnalysis:
         return "\n".join(lines)
 
 
-def analyze_flow(positions: list[dict]) -> FlowAnalysis:
-    """Analyze order flow and accumulation patterns."""
+def analyze_flow(positions: list[dict], soa: PositionsSoA | None = None) -> FlowAnalysis:
+    """Analyze order flow and accumulation patterns.
+
+    `soa` is an optional precomputed to_soa(positions), shared across analyzers.
+    """
     result = FlowAnalysis(total_positions=len(positions))
     if not positions:
         return result
-
-    result.total_volume_bought = sum(p.get("tb", 0) for p in positions)
-    pnls = [p.get("pnl", 0) for p in positions]
-    result.total_pnl = sum(pnls)
-
-    # Win/loss
-    wins = [p for p in positions if p.get("pnl", 0) > 0]
-    losses = [p for p in positions if p.get("pnl", 0) <= 0]
-    result.win_count = len(wins)
-    result.loss_count = len(losses)
-    result.win_rate = len(wins) / len(positions) if positions else 0
-
-    if wins:
-        win_pnls = [p["pnl"] for p in wins]
-        result.avg_win = sum(win_pnls) / len(win_pnls)
-        result.max_single_win = max(win_pnls)
-    if losses:
-        loss_pnls = [p["pnl"] for p in losses]
-        result.avg_loss = sum(loss_pnls) / len(loss_pnls)
-        result.max_single_loss = min(loss_pnls)
+    if soa is None:
+        soa = to_soa(positions)
+
+    pnl = soa.pnl
+    result.total_volume_bought = float(soa.tb.sum())
+    result.total_pnl = float(pnl.sum())
+
+    # Win/loss: one comparison pass; counts, sums and extremes are reductions over the two splits
+    is_win = pnl > 0
+    win_pnls = pnl[is_win]
+    loss_pnls = pnl[~is_win]
+    result.win_count = int(win_pnls.size)
+    result.loss_count = int(loss_pnls.size)
+    result.win_rate = result.win_count / len(positions) if positions else 0
+
+    gross_profit = float(win_pnls.sum())
+    gross_loss_signed = float(loss_pnls.sum())
+    if win_pnls.size:
+        result.avg_win = gross_profit / win_pnls.size
+        result.max_single_win = float(win_pnls.max())
+    if loss_pnls.size:
+        result.avg_loss = gross_loss_signed / loss_pnls.size
+        result.max_single_loss = float(loss_pnls.min())
 
     # Profit factor
-    gross_profit = sum(p["pnl"] for p in wins) if wins else 0
-    gross_loss = abs(sum(p["pnl"] for p in losses)) if losses else 1
+    gross_loss = abs(gross_loss_signed) if loss_pnls.size else 1
     result.profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
 
     # Expectancy
@@ -88,23 +95,27 @@ def analyze_flow(positions: list[dict]) -> FlowAnalysis:
     if result.avg_loss != 0:
         result.risk_reward_ratio = result.avg_win / abs(result.avg_loss)
 
-    # Accumulation: multiple entries in same market
-    market_entries: dict[str, int] = defaultdict(int)
-    for p in positions:
-        cid = p.get("cid", "")
-        if cid:
-            market_entries[cid] += 1
-    result.multi_entry_markets = sum(1 for v in market_entries.values() if v > 1)
-    if market_entries:
-        result.avg_entries_per_market = len(positions) / len(market_entries)
-
-    # Monthly flow
-    for p in positions:
-        ts = p.get("ts", 0)
-        if ts > 0:
-            month = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m")
-            result.monthly_pnl[month] = result.monthly_pnl.get(month, 0) + p.get("pnl", 0)
-            result.monthly_volume[month] = result.monthly_volume.get(month, 0) + p.get("tb", 0)
+    # Accumulation: multiple entries in same market (positions without a condition id don't count)
+    entries = np.bincount(soa.cid_codes, minlength=len(soa.cids))
+    if "" in soa.cids:
+        entries[soa.cids.index("")] = 0
+    markets_entered = int(np.count_nonzero(entries))
+    result.multi_entry_markets = int(np.count_nonzero(entries > 1))
+    if markets_entered:
+        result.avg_entries_per_market = len(positions) / markets_entered
+
+    # Monthly flow: bucket UTC months as datetime64[M], then one weighted bincount per column
+    dated = soa.ts > 0
+    months, first_seen, month_idx = np.unique(
+        soa.ts[dated].astype("datetime64[s]").astype("datetime64[M]"),
+        return_index=True, return_inverse=True,
+    )
+    month_pnl = np.bincount(month_idx, weights=soa.pnl[dated], minlength=len(months)).tolist()
+    month_vol = np.bincount(month_idx, weights=soa.tb[dated], minlength=len(months)).tolist()
+    for k in np.argsort(first_seen).tolist():  # keep first-seen key order
+        month = str(months[k])  # "YYYY-MM"
+        result.monthly_pnl[month] = month_pnl[k]
+        result.monthly_volume[month] = month_vol[k]
 
     # Trend
     if len(result.monthly_pnl) >= 3:
@@ -136,7 +147,7 @@ def analyze_flow(positions: list[dict]) -> FlowAnalysis:
     if result.risk_reward_ratio > 3:
         result.signals.append(f"HIGH_RR: {result.risk_reward_ratio:.1f}x — asymmetric payoffs")
     
-    if result.multi_entry_markets > len(market_entries) * 0.3 and len(market_entries) > 5:
+    if result.multi_entry_markets > markets_entered * 0.3 and markets_entered > 5:
         result.signals.append(f"ACCUMULATOR: re-enters {result.multi_entry_markets} markets — builds positions over time")
 
     if result.max_single_loss and abs(result.max_single_loss) > result.total_volume_bought * 0.1:
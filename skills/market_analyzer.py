@@ -4,6 +4,11 @@ from __future__ import annotations
 import re
 from collections import Counter
 from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+from ._position_arrays import PositionsSoA, to_soa
 
 
 # Keyword-based category detection
@@ -64,12 +69,54 @@ CATEGORY_RULES = [
 ]
 
 
-def _categorize_market(title: str) -> str:
-    title_lower = title.lower()
-    for category, patterns in CATEGORY_RULES:
-        for pattern in patterns:
-            if re.search(pattern, title_lower):
-                return category
+_REGEX_CHARS = frozenset("\\.^$*+?{}[]|()")
+
+
+def _trie_pattern(words: list[str]) -> str:
+    """Regex matching any of `words`, factored as a prefix trie.
+
+    "bears|bengals|bills" becomes "b(?:e(?:ars|ngals)|ills)", so the regex
+    engine walks shared prefixes once instead of retrying every keyword at each
+    position: the closest thing to an Aho-Corasick automaton using `re` alone.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else f"(?:{'|'.join(alts)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _compile_category(patterns: list[str]):
+    """One regex per category: plain keywords go into a trie, real regexes are kept as-is."""
+    literals = [p for p in patterns if not _REGEX_CHARS.intersection(p)]
+    regexes = [f"(?:{p})" for p in patterns if _REGEX_CHARS.intersection(p)]
+    return re.compile("|".join(([_trie_pattern(literals)] if literals else []) + regexes))
+
+
+# One alternation per category, compiled once: a single regex scan per category
+# instead of a cached-pattern lookup + search per keyword.
+_COMPILED_RULES = [
+    (category, _compile_category(patterns))
+    for category, patterns in CATEGORY_RULES
+]
+
+
+@lru_cache(maxsize=8192)
+def _categorize_market(title_lower: str) -> str:
+    """Category of an already-lowercased title (see PositionsSoA.titles_lower)."""
+    for category, rx in _COMPILED_RULES:
+        if rx.search(title_lower):
+            return category
     return "other"
 
 
@@ -114,31 +161,35 @@ class MarketAnalysis:
         return "\n".join(lines)
 
 
-def analyze_markets(positions: list[dict]) -> MarketAnalysis:
-    """Analyze market selection patterns."""
+def analyze_markets(positions: list[dict], soa: PositionsSoA | None = None) -> MarketAnalysis:
+    """Analyze market selection patterns.
+
+    `soa` is an optional precomputed to_soa(positions), shared across analyzers.
+    """
     result = MarketAnalysis(total_positions=len(positions))
     if not positions:
         return result
+    if soa is None:
+        soa = to_soa(positions)
 
     # Unique markets
-    cids = set(p.get("cid", "") for p in positions if p.get("cid"))
-    result.unique_markets = len(cids)
-    titles = set(p.get("t", "") for p in positions if p.get("t"))
-    result.unique_titles = len(titles)
-
-    # Category analysis
-    cat_counts: Counter = Counter()
-    cat_pnl: dict[str, float] = {}
-    cat_vol: dict[str, float] = {}
-    for p in positions:
-        cat = _categorize_market(p.get("t", ""))
-        cat_counts[cat] += 1
-        cat_pnl[cat] = cat_pnl.get(cat, 0) + p.get("pnl", 0)
-        cat_vol[cat] = cat_vol.get(cat, 0) + p.get("tb", 0)
+    result.unique_markets = len(soa.cids) - ("" in soa.cids)
+    result.unique_titles = len(soa.titles) - ("" in soa.titles)
+
+    # Category analysis: categorize each distinct title once, then group by code
+    cat_keys: dict[str, int] = {}
+    title_cat = np.array([cat_keys.setdefault(_categorize_market(t), len(cat_keys)) for t in soa.titles_lower],
+                         dtype=np.int64)
+    cat_codes = title_cat[soa.title_codes]
+    cats = list(cat_keys)
+    counts = np.bincount(cat_codes, minlength=len(cats)).tolist()
+    pnl_sums = np.bincount(cat_codes, weights=soa.pnl, minlength=len(cats)).tolist()
+    vol_sums = np.bincount(cat_codes, weights=soa.tb, minlength=len(cats)).tolist()
+    cat_counts = Counter(dict(zip(cats, counts)))
 
     result.category_counts = dict(cat_counts.most_common())
-    result.category_pnl = cat_pnl
-    result.category_volume = cat_vol
+    result.category_pnl = dict(zip(cats, pnl_sums))
+    result.category_volume = dict(zip(cats, vol_sums))
 
     if cat_counts:
         top_cat, top_count = cat_counts.most_common(1)[0]
@@ -146,31 +197,29 @@ def analyze_markets(positions: list[dict]) -> MarketAnalysis:
         result.category_concentration = top_count / len(positions)
 
     # Herfindahl index (market-level concentration)
-    market_volumes: dict[str, float] = {}
-    for p in positions:
-        cid = p.get("cid", "unknown")
-        market_volumes[cid] = market_volumes.get(cid, 0) + p.get("tb", 0)
-    total_vol = sum(market_volumes.values()) or 1
-    result.herfindahl_index = sum((v / total_vol) ** 2 for v in market_volumes.values())
-
-    # Top markets by volume
-    market_pnl: dict[str, float] = {}
-    market_titles: dict[str, str] = {}
-    for p in positions:
-        cid = p.get("cid", "unknown")
-        market_pnl[cid] = market_pnl.get(cid, 0) + p.get("pnl", 0)
-        market_titles[cid] = p.get("t", "?")
-    
-    sorted_markets = sorted(market_volumes.items(), key=lambda x: -x[1])
+    n_markets = len(soa.cids)
+    market_volumes = np.bincount(soa.cid_codes, weights=soa.tb, minlength=n_markets)
+    total_vol = float(market_volumes.sum()) or 1
+    shares = market_volumes / total_vol
+    result.herfindahl_index = float(shares @ shares)
+
+    # Top markets by volume (stable: ties keep first-seen order); title is the market's last-seen one
+    market_pnl = np.bincount(soa.cid_codes, weights=soa.pnl, minlength=n_markets)
+    last_seen = np.zeros(n_markets, dtype=np.int64)
+    np.maximum.at(last_seen, soa.cid_codes, np.arange(len(positions)))
+    candidates = np.arange(n_markets)
+    if n_markets > 10:
+        # O(M) partition to the 10th-largest volume, then sort only the markets at or above it
+        cutoff = np.partition(market_volumes, n_markets - 10)[n_markets - 10]
+        candidates = np.flatnonzero(market_volumes >= cutoff)
+    top = candidates[np.argsort(-market_volumes[candidates], kind="stable")][:10].tolist()
     result.top_markets = [
-        (market_titles.get(cid, "?"), vol, market_pnl.get(cid, 0))
-        for cid, vol in sorted_markets[:10]
+        (soa.titles[soa.title_codes[last_seen[m]]], float(market_volumes[m]), float(market_pnl[m]))
+        for m in top
     ]
 
     # Outcome preference
-    outcomes = [p.get("o", "").lower() for p in positions]
-    yes_count = sum(1 for o in outcomes if o == "yes")
-    no_count = sum(1 for o in outcomes if o == "no")
+    _, yes_count, no_count = np.bincount(soa.side, minlength=3).tolist()
     total_outcomes = yes_count + no_count or 1
     result.yes_pct = yes_count / total_outcomes
     result.no_pct = no_count / total_outcomes
@@ -4,6 +4,10 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from ._position_arrays import PositionsSoA, to_soa
+
 
 @dataclass
 class PatternAnalysis:
@@ -49,141 +53,91 @@ class PatternAnalysis:
         return "\n".join(lines)
 
 
-def _compute_streaks(results: list[bool]) -> tuple[int, int, float, float, int]:
-    """Compute max/avg win and loss streaks, and current streak."""
-    if not results:
+def _runs(is_win: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Run-length encode a win/loss sequence: (run lengths, whether each run is wins)."""
+    edges = np.concatenate(([0], np.flatnonzero(is_win[1:] != is_win[:-1]) + 1, [len(is_win)]))
+    return np.diff(edges), is_win[edges[:-1]]
+
+
+def _compute_streaks(lengths: np.ndarray, win_run: np.ndarray) -> tuple[int, int, float, float, int]:
+    """Compute max/avg win and loss streaks, and current streak, from _runs() output."""
+    if not len(lengths):
         return 0, 0, 0, 0, 0
-    
-    win_streaks = []
-    loss_streaks = []
-    current = 0
-    is_win = results[0]
-    streak_len = 0
-
-    for r in results:
-        if r == is_win:
-            streak_len += 1
-        else:
-            if is_win:
-                win_streaks.append(streak_len)
-            else:
-                loss_streaks.append(streak_len)
-            is_win = r
-            streak_len = 1
-    # Final streak
-    if is_win:
-        win_streaks.append(streak_len)
-    else:
-        loss_streaks.append(streak_len)
 
-    current_streak = streak_len if is_win else -streak_len
-    max_w = max(win_streaks) if win_streaks else 0
-    max_l = max(loss_streaks) if loss_streaks else 0
-    avg_w = sum(win_streaks) / len(win_streaks) if win_streaks else 0
-    avg_l = sum(loss_streaks) / len(loss_streaks) if loss_streaks else 0
+    win_streaks = lengths[win_run]
+    loss_streaks = lengths[~win_run]
+    current_streak = int(lengths[-1]) if win_run[-1] else -int(lengths[-1])
+    max_w = int(win_streaks.max(initial=0))
+    max_l = int(loss_streaks.max(initial=0))
+    avg_w = float(win_streaks.mean()) if win_streaks.size else 0
+    avg_l = float(loss_streaks.mean()) if loss_streaks.size else 0
     return max_w, max_l, avg_w, avg_l, current_streak
 
 
-def analyze_patterns(positions: list[dict]) -> PatternAnalysis:
-    """Analyze win/loss patterns and behavioral tendencies."""
+def analyze_patterns(positions: list[dict], soa: PositionsSoA | None = None) -> PatternAnalysis:
+    """Analyze win/loss patterns and behavioral tendencies.
+
+    `soa` is an optional precomputed to_soa(positions), shared across analyzers.
+    """
     result = PatternAnalysis(total_positions=len(positions))
     if len(positions) < 2:
         return result
+    if soa is None:
+        soa = to_soa(positions)
 
-    # Sort by timestamp
-    sorted_pos = sorted(positions, key=lambda p: p.get("ts", 0))
-    results = [p.get("pnl", 0) > 0 for p in sorted_pos]
+    # Time order (stable, like sorted() on the dicts), shared via the soa
+    order = soa.ts_order
+    pnl = soa.pnl[order]
+    tb = soa.tb[order]
+    is_win = pnl > 0
+    lengths, win_run = _runs(is_win)
 
     # Streaks
-    max_w, max_l, avg_w, avg_l, current = _compute_streaks(results)
+    max_w, max_l, avg_w, avg_l, current = _compute_streaks(lengths, win_run)
     result.max_win_streak = max_w
     result.max_loss_streak = max_l
     result.avg_win_streak = avg_w
     result.avg_loss_streak = avg_l
     result.current_streak = current
 
-    # Drawdown analysis
-    cumulative = []
-    running = 0.0
-    for p in sorted_pos:
-        running += p.get("pnl", 0)
-        cumulative.append(running)
-
-    peak = cumulative[0]
-    max_dd = 0.0
-    max_dd_peak = peak
-    dd_start = 0
-    max_dd_start = 0
-    max_dd_end = 0
-    for i, val in enumerate(cumulative):
-        if val > peak:
-            peak = val
-            dd_start = i
-        dd = peak - val
-        if dd > max_dd:
-            max_dd = dd
-            max_dd_peak = peak
-            max_dd_start = dd_start
-            max_dd_end = i
+    # Drawdown analysis: running peak vs cumulative PnL; the max drawdown ends at
+    # the first index with the largest gap (argmax returns the first maximum).
+    # Peaks are turned into drawdowns in place, so only one temporary is allocated.
+    cumulative = np.cumsum(pnl)
+    drawdowns = np.maximum.accumulate(cumulative)
+    drawdowns -= cumulative
+    max_dd_end = int(drawdowns.argmax())
+    max_dd = float(drawdowns[max_dd_end])
+    max_dd_peak = float(cumulative[:max_dd_end + 1].max())
 
     result.max_drawdown = max_dd
     result.max_drawdown_pct = max_dd / max_dd_peak if max_dd_peak > 0 else 0
 
-    # Recovery from max drawdown
+    # Recovery from max drawdown: positions up to and including the first back at the peak
     if max_dd > 0:
-        recovery_count = 0
-        for i in range(max_dd_end, len(cumulative)):
-            recovery_count += 1
-            if cumulative[i] >= max_dd_peak:
-                break
-        result.drawdown_duration_positions = recovery_count
-
-    # Recovery from loss streaks (3+)
-    loss_streak = 0
-    recovery_lengths = []
-    in_recovery = False
-    recovery_len = 0
-    for r in results:
-        if not r:
-            loss_streak += 1
-            if in_recovery:
-                in_recovery = False
-        else:
-            if loss_streak >= 3:
-                in_recovery = True
-                recovery_len = 0
-                result.recoveries_from_loss += 1
-            if in_recovery:
-                recovery_len += 1
-            loss_streak = 0
-    if recovery_lengths:
-        result.avg_recovery_length = sum(recovery_lengths) / len(recovery_lengths)
+        back = cumulative[max_dd_end:] >= max_dd_peak
+        first = int(back.argmax())
+        result.drawdown_duration_positions = first + 1 if back[first] else len(back)
+
+    # Recovery from loss streaks (3+): loss runs of 3+ that a win run follows
+    recovered = (lengths[:-1] >= 3) & ~win_run[:-1]
+    result.recoveries_from_loss = int(np.count_nonzero(recovered))
 
     # Behavior after wins/losses (sizing changes)
-    sizes = [p.get("tb", 0) for p in sorted_pos]
-    avg_size = sum(sizes) / len(sizes) if sizes else 1
-
-    after_loss_sizes = []
-    after_win_sizes = []
-    for i in range(1, len(sorted_pos)):
-        prev_pnl = sorted_pos[i-1].get("pnl", 0)
-        curr_size = sorted_pos[i].get("tb", 0)
-        if prev_pnl <= 0:
-            after_loss_sizes.append(curr_size)
-        else:
-            after_win_sizes.append(curr_size)
-
-    if after_loss_sizes and avg_size > 0:
-        result.size_after_loss_ratio = (sum(after_loss_sizes) / len(after_loss_sizes)) / avg_size
-    if after_win_sizes and avg_size > 0:
-        result.size_after_win_ratio = (sum(after_win_sizes) / len(after_win_sizes)) / avg_size
-
-    # Edge consistency: first half vs second half win rate
-    mid = len(results) // 2
-    first_half = results[:mid]
-    second_half = results[mid:]
-    result.first_half_winrate = sum(first_half) / len(first_half) if first_half else 0
-    result.second_half_winrate = sum(second_half) / len(second_half) if second_half else 0
+    avg_size = float(tb.mean())
+    after_loss_sizes = tb[1:][~is_win[:-1]]
+    after_win_sizes = tb[1:][is_win[:-1]]
+
+    if after_loss_sizes.size and avg_size > 0:
+        result.size_after_loss_ratio = float(after_loss_sizes.mean()) / avg_size
+    if after_win_sizes.size and avg_size > 0:
+        result.size_after_win_ratio = float(after_win_sizes.mean()) / avg_size
+
+    # Edge consistency: first half vs second half win rate, counted off the shared mask
+    mid = len(is_win) // 2
+    first_wins = int(np.count_nonzero(is_win[:mid]))
+    result.first_half_winrate = first_wins / mid if mid else 0
+    result.second_half_winrate = (int(np.count_nonzero(is_win)) - first_wins) / (len(is_win) - mid)
     
     if result.second_half_winrate > result.first_half_winrate + 0.05:
         result.edge_trend = "improving"
@@ -195,11 +149,11 @@ def analyze_patterns(positions: list[dict]) -> PatternAnalysis:
     # PnL curve linearity (R²)
     n = len(cumulative)
     if n >= 10:
-        x_mean = (n - 1) / 2
-        y_mean = sum(cumulative) / n
-        ss_xy = sum((i - x_mean) * (y - y_mean) for i, y in enumerate(cumulative))
-        ss_xx = sum((i - x_mean) ** 2 for i in range(n))
-        ss_yy = sum((y - y_mean) ** 2 for y in cumulative)
+        # x = 0..n-1, so ss_xx has the closed form n(n²-1)/12; the rest are two dot products
+        y_centered = cumulative - cumulative.mean()
+        ss_xy = float((np.arange(n) - (n - 1) / 2) @ y_centered)
+        ss_xx = n * (n * n - 1) / 12
+        ss_yy = float(y_centered @ y_centered)
         if ss_xx > 0 and ss_yy > 0:
             r = ss_xy / (ss_xx * ss_yy) ** 0.5
             result.pnl_curve_r2 = r ** 2
@@ -1,9 +1,15 @@
 """Position sizing analysis: consistency, scaling behavior, size distribution."""
 
 from __future__ import annotations
-import statistics
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from ._position_arrays import PositionsSoA, to_soa
+
+# Upper bounds (exclusive) of the micro/small/medium/large buckets; whale is the rest
+_SIZE_BUCKET_EDGES = np.array([100, 1000, 10000, 100000], dtype=np.float64)
+
 
 @dataclass
 class SizingAnalysis:
@@ -50,62 +56,65 @@ class SizingAnalysis:
         return "\n".join(lines)
 
 
-def analyze_sizing(positions: list[dict]) -> SizingAnalysis:
-    """Analyze position sizing patterns."""
+def analyze_sizing(positions: list[dict], soa: PositionsSoA | None = None) -> SizingAnalysis:
+    """Analyze position sizing patterns.
+
+    `soa` is an optional precomputed to_soa(positions), shared across analyzers.
+    """
     result = SizingAnalysis(total_positions=len(positions))
     if not positions:
         return result
-
-    sizes = [p.get("tb", 0) for p in positions if p.get("tb", 0) > 0]
-    if not sizes:
+    if soa is None:
+        soa = to_soa(positions)
+
+    tb, pnl, ap = soa.tb, soa.pnl, soa.ap
+    sized = tb > 0
+    size_arr = tb[sized]
+    n_sized = size_arr.size
+    if not n_sized:
         return result
 
-    result.total_volume = sum(sizes)
-    result.avg_position_size = statistics.mean(sizes)
-    result.median_position_size = statistics.median(sizes)
-    result.min_position_size = min(sizes)
-    result.max_position_size = max(sizes)
-    result.std_position_size = statistics.stdev(sizes) if len(sizes) > 1 else 0
+    # Summary stats as NumPy reductions over the one size array (median is an O(N) select)
+    result.total_volume = float(size_arr.sum())
+    result.avg_position_size = result.total_volume / n_sized
+    result.median_position_size = float(np.median(size_arr))
+    result.min_position_size = float(size_arr.min())
+    result.max_position_size = float(size_arr.max())
+    result.std_position_size = float(size_arr.std(ddof=1)) if n_sized > 1 else 0
 
     # CV
     if result.avg_position_size > 0:
         result.coefficient_of_variation = result.std_position_size / result.avg_position_size
 
-    # Size buckets
-    for s in sizes:
-        if s < 100:
-            result.micro_count += 1
-        elif s < 1000:
-            result.small_count += 1
-        elif s < 10000:
-            result.medium_count += 1
-        elif s < 100000:
-            result.large_count += 1
-        else:
-            result.whale_count += 1
-
-    # Concentration: top 10% of positions by size
-    sorted_sizes = sorted(sizes, reverse=True)
-    top_n = max(1, len(sorted_sizes) // 10)
-    result.size_concentration = sum(sorted_sizes[:top_n]) / result.total_volume
+    # Size buckets: bucket i holds sizes in [edge[i-1], edge[i])
+    buckets = np.bincount(np.searchsorted(_SIZE_BUCKET_EDGES, size_arr, side="right"), minlength=5)
+    (result.micro_count, result.small_count, result.medium_count,
+     result.large_count, result.whale_count) = buckets.tolist()
+
+    # Concentration: top 10% of positions by size (partition, no full sort needed)
+    top_n = max(1, n_sized // 10)
+    result.size_concentration = float(np.partition(size_arr, -top_n)[-top_n:].sum()) / result.total_volume
 
     # Win vs loss sizing
-    wins = [p for p in positions if p.get("pnl", 0) > 0 and p.get("tb", 0) > 0]
-    losses = [p for p in positions if p.get("pnl", 0) <= 0 and p.get("tb", 0) > 0]
-    if wins:
-        result.avg_win_size = statistics.mean(p["tb"] for p in wins)
-    if losses:
-        result.avg_loss_size = statistics.mean(p["tb"] for p in losses)
+    is_win = pnl > 0
+    win_sizes = tb[sized & is_win]
+    loss_sizes = tb[sized & ~is_win]
+    if win_sizes.size:
+        result.avg_win_size = float(win_sizes.mean())
+    if loss_sizes.size:
+        result.avg_loss_size = float(loss_sizes.mean())
     if result.avg_loss_size > 0:
         result.win_loss_size_ratio = result.avg_win_size / result.avg_loss_size
 
     # Entry price distribution
-    entries = [p.get("ap", 0) for p in positions if 0 < p.get("ap", 0) <= 1]
-    if entries:
-        result.avg_entry_price = statistics.mean(entries)
-        result.low_odds_pct = sum(1 for e in entries if e < 0.3) / len(entries)
-        result.mid_odds_pct = sum(1 for e in entries if 0.3 <= e <= 0.7) / len(entries)
-        result.high_odds_pct = sum(1 for e in entries if e > 0.7) / len(entries)
+    entry_arr = ap[(ap > 0) & (ap <= 1)]
+    if entry_arr.size:
+        result.avg_entry_price = float(entry_arr.mean())
+        low = int(np.count_nonzero(entry_arr < 0.3))
+        high = int(np.count_nonzero(entry_arr > 0.7))
+        result.low_odds_pct = low / entry_arr.size
+        result.mid_odds_pct = (entry_arr.size - low - high) / entry_arr.size
+        result.high_odds_pct = high / entry_arr.size
 
     # Signals
     if result.coefficient_of_variation < 0.5:
@@ -113,8 +122,8 @@ def analyze_sizing(positions: list[dict]) -> SizingAnalysis:
     elif result.coefficient_of_variation > 2.0:
         result.signals.append("HIGHLY_VARIABLE_SIZING: high CV — mixes small and very large bets")
 
-    if result.whale_count > 0 and result.whale_count / len(sizes) > 0.1:
-        result.signals.append(f"WHALE_SIZING: {result.whale_count} positions >$100K ({result.whale_count/len(sizes):.0%})")
+    if result.whale_count > 0 and result.whale_count / n_sized > 0.1:
+        result.signals.append(f"WHALE_SIZING: {result.whale_count} positions >$100K ({result.whale_count/n_sized:.0%})")
 
     if result.size_concentration > 0.5:
         result.signals.append(f"CONCENTRATED: top 10% of positions = {result.size_concentration:.0%} of volume")
@@ -1,10 +1,16 @@
 """Timing analysis: time-of-day patterns, event-driven entries, speed-to-market."""
 
 from __future__ import annotations
-from datetime import datetime, timezone
-from collections import Counter
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from ._position_arrays import PositionsSoA, to_soa
+
+# 1970-01-01 was a Thursday; weekday numbering follows datetime.weekday() (Monday=0)
+_EPOCH_WEEKDAY = 3
+_DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
 
 @dataclass
 class TimingAnalysis:
@@ -42,58 +48,74 @@ class TimingAnalysis:
         return "\n".join(lines)
 
 
-def analyze_timing(positions: list[dict]) -> TimingAnalysis:
+def _tally(values: np.ndarray, size: int) -> tuple[list[int], list[int]]:
+    """Histogram of small non-negative ints, plus the values present ranked like
+    Counter.most_common(): count descending, ties by first occurrence."""
+    counts = np.bincount(values, minlength=size)
+    first = np.full(size, len(values))
+    np.minimum.at(first, values, np.arange(len(values)))
+    seen = np.flatnonzero(counts)
+    ranked = seen[np.lexsort((first[seen], -counts[seen]))]
+    return counts.tolist(), ranked.tolist()
+
+
+def analyze_timing(positions: list[dict], soa: PositionsSoA | None = None) -> TimingAnalysis:
     """Analyze timing patterns from position data.
     
     Args:
         positions: List of position dicts with keys: tb, ap, cp, pnl, ts, t, cid, o
+        soa: Optional precomputed to_soa(positions), shared across analyzers
     """
     result = TimingAnalysis(total_positions=len(positions))
     if not positions:
         return result
+    if soa is None:
+        soa = to_soa(positions)
 
-    # Filter positions with valid timestamps
-    timed = [p for p in positions if p.get("ts", 0) > 0]
-    if not timed:
+    # Positions with valid timestamps, in time order: a suffix of the shared sort
+    ts = soa.ts[soa.ts_order]
+    ts = ts[np.searchsorted(ts, 0, side="right"):]
+    if not ts.size:
         return result
 
-    timestamps = sorted(p["ts"] for p in timed)
-    datetimes = [datetime.fromtimestamp(ts, tz=timezone.utc) for ts in timestamps]
+    # UTC calendar fields straight from epoch seconds (no per-position datetime objects)
+    day_numbers = ts // 86400
+    hour_arr = ts % 86400 // 3600
+    weekday_arr = (day_numbers + _EPOCH_WEEKDAY) % 7
 
     # Hour distribution
-    hours = Counter(dt.hour for dt in datetimes)
-    result.hour_distribution = dict(sorted(hours.items()))
-    result.peak_hours = [h for h, _ in hours.most_common(3)]
+    hour_counts, hour_rank = _tally(hour_arr, 24)
+    result.hour_distribution = {h: c for h, c in enumerate(hour_counts) if c}
+    result.peak_hours = hour_rank[:3]
 
     # Off-hours (before 8am or after 10pm UTC)
-    off_hours = sum(1 for dt in datetimes if dt.hour < 8 or dt.hour >= 22)
-    result.off_hours_pct = off_hours / len(datetimes)
+    off_hours = int(np.count_nonzero((hour_arr < 8) | (hour_arr >= 22)))
+    result.off_hours_pct = off_hours / len(ts)
 
     # Day of week
-    days = Counter(dt.strftime("%A") for dt in datetimes)
-    result.day_distribution = dict(days.most_common())
-    weekend = sum(1 for dt in datetimes if dt.weekday() >= 5)
-    result.weekend_pct = weekend / len(datetimes)
+    day_counts, day_rank = _tally(weekday_arr, 7)
+    result.day_distribution = {_DAY_NAMES[w]: day_counts[w] for w in day_rank}
+    weekend = int(np.count_nonzero(weekday_arr >= 5))
+    result.weekend_pct = weekend / len(ts)
 
     # Time span and consistency
-    unique_days = set(dt.date() for dt in datetimes)
-    result.active_days = len(unique_days)
-    if len(timestamps) >= 2:
-        span = (timestamps[-1] - timestamps[0]) / 86400
-        result.total_span_days = max(1, int(span))
+    result.active_days = int(np.unique(day_numbers).size)
+    span_seconds = int(ts[-1] - ts[0])
+    if len(ts) >= 2:
+        result.total_span_days = max(1, span_seconds // 86400)
         result.daily_consistency = result.active_days / result.total_span_days
     else:
         result.total_span_days = 1
         result.daily_consistency = 1.0
 
-    # Average days between trades
-    if len(timestamps) >= 2:
-        gaps = [(timestamps[i+1] - timestamps[i]) / 86400 for i in range(len(timestamps)-1)]
-        result.avg_days_between_trades = sum(gaps) / len(gaps)
+    # Average days between trades: consecutive gaps of sorted timestamps telescope to the span
+    if len(ts) >= 2:
+        result.avg_days_between_trades = span_seconds / 86400 / (len(ts) - 1)
 
     # Burst trading detection: >5 trades in same hour-bucket
-    hour_buckets = Counter((dt.date(), dt.hour) for dt in datetimes)
-    result.burst_trading_episodes = sum(1 for count in hour_buckets.values() if count > 5)
+    # ts // 3600 is a global (date, hour) key in UTC
+    _, bucket_counts = np.unique(ts // 3600, return_counts=True)
+    result.burst_trading_episodes = int(np.count_nonzero(bucket_counts > 5))
 
     # Generate signals
     if result.daily_consistency > 0.8:
@@ -109,10 +131,10 @@ def analyze_timing(positions: list[dict]) -> TimingAnalysis:
 
     if result.weekend_pct > 0.35:
         result.signals.append("WEEKEND_ACTIVE: significant weekend trading")
-    elif result.weekend_pct < 0.05 and len(datetimes) > 50:
+    elif result.weekend_pct < 0.05 and len(ts) > 50:
         result.signals.append("WEEKDAY_ONLY: almost no weekend trades — may follow business/sports schedule")
 
-    if result.avg_days_between_trades < 0.1 and len(timestamps) > 100:
+    if result.avg_days_between_trades < 0.1 and len(ts) > 100:
         result.signals.append("HIGH_FREQUENCY: trades multiple times per day on average")
 
     return result